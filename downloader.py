@@ -7,6 +7,7 @@ import time
 import json
 import zipfile
 import hashlib
+import concurrent.futures
 import yaml
 from typing import Optional, Tuple, Callable
 
@@ -20,6 +21,47 @@ from huggingface_hub import (
 
 os.environ.setdefault("HF_HUB_ENABLE_HF_XET", "1")
 
+try:
+    HF_HTTP_POOL_SIZE = max(1, int(os.getenv("HF_HTTP_POOL_SIZE", "32")))
+except Exception:
+    HF_HTTP_POOL_SIZE = 32
+
+
+def _http_backend_factory():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Retry transient gateway errors on idempotent requests. 429 is left to the
+    # callers, which pause searches instead of hammering the API.
+    retries = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HF_HTTP_POOL_SIZE,
+        pool_maxsize=HF_HTTP_POOL_SIZE,
+        max_retries=retries,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+try:
+    # Older huggingface_hub releases use a requests session per thread; widen its
+    # connection pool so metadata and download calls reuse keep-alive connections.
+    from huggingface_hub import configure_http_backend
+    configure_http_backend(backend_factory=_http_backend_factory)
+except Exception:
+    pass
+
+# Shared client for metadata/upload calls instead of constructing one per call.
+_HF_API = HfApi()
+
 token_override = os.getenv("HF_TOKEN")
 _sha_max_env = os.getenv("HF_DOWNLOADER_SHA_MAX_BYTES", "0")
 try:
@@ -27,6 +69,11 @@ try:
 except Exception:
     _sha_max_val = 0
 SHA_VERIFY_MAX_BYTES = _sha_max_val if _sha_max_val > 0 else None
+try:
+    DOWNLOAD_CONCURRENCY = max(1, int(os.getenv("HF_DOWNLOADER_CONCURRENCY", "8")))
+except Exception:
+    DOWNLOAD_CONCURRENCY = 8
+FOLDER_MONITOR_STEP_PERCENT = 5
 
 def folder_size(directory: str) -> int:
     total = 0
@@ -67,17 +114,38 @@ def clear_cache_for_path(downloaded_path: str):
         print(f"[DEBUG] Cache cleaning failed: {e}")
 
 
+_settings_token_cache: Tuple[str, int, str] | None = None
+_settings_token_lock = threading.Lock()
+
+
+def _read_settings_token(settings_path: str) -> str:
+    """
+    Return downloader.hf_token from comfy.settings.json, re-parsing the file only
+    when its mtime changes.
+    """
+    global _settings_token_cache
+    try:
+        mtime = os.stat(settings_path).st_mtime_ns
+    except FileNotFoundError:
+        return ""
+    with _settings_token_lock:
+        cached = _settings_token_cache
+        if cached is not None and cached[:2] == (settings_path, mtime):
+            return cached[2]
+        with open(settings_path, "r") as f:
+            settings = json.load(f)
+        token = settings.get("downloader.hf_token", "").strip()
+        _settings_token_cache = (settings_path, mtime, token)
+        return token
+
+
 def get_token():
     """
     Load the Hugging Face token from comfy.settings.json.
     If not found or empty, fall back to the HF_TOKEN environment variable.
     """
     settings_path = os.path.join("user", "default", "comfy.settings.json")
-    token = ""
-    if os.path.exists(settings_path):
-        with open(settings_path, "r") as f:
-            settings = json.load(f)
-        token = settings.get("downloader.hf_token", "").strip()
+    token = _read_settings_token(settings_path)
     if not token:  # Fallback to HF_TOKEN environment variable
         token = os.getenv("HF_TOKEN", "").strip()
     return token
@@ -105,8 +173,7 @@ def get_remote_file_metadata(repo_id: str,
                              revision: str = None,
                              token: str = None) -> Tuple[Optional[int], Optional[str], Optional[str]]:
     try:
-        api = HfApi()
-        info = api.model_info(repo_id, revision=revision, token=token, files_metadata=True)
+        info = _HF_API.model_info(repo_id, revision=revision, token=token, files_metadata=True)
         siblings = getattr(info, "siblings", []) or []
         for sibling in siblings:
             if getattr(sibling, "rfilename", None) != remote_filename:
@@ -168,16 +235,53 @@ def _verify_file_integrity(dest_path: str,
             raise RuntimeError("SHA256 mismatch")
 
 
+def _copy_and_hash(src_path: str,
+                   dest_path: str,
+                   expected_size: Optional[int],
+                   expected_sha: Optional[str],
+                   status_cb: Optional[Callable[[str], None]] = None):
+    """
+    Copy src_path to dest_path and verify size/SHA256 in the same streaming pass,
+    so the destination does not have to be re-read for verification.
+    status_cb gets "verifying" once the copy is written, before the checks.
+    """
+    if expected_sha and SHA_VERIFY_MAX_BYTES is not None:
+        size_for_sha = expected_size if expected_size is not None else os.path.getsize(src_path)
+        if size_for_sha > SHA_VERIFY_MAX_BYTES:
+            print(f"[DEBUG] Skipping SHA256 for large file ({size_for_sha} bytes).")
+            expected_sha = None
+
+    if not expected_sha:
+        shutil.copyfile(src_path, dest_path)
+        if status_cb:
+            status_cb("verifying")
+        _verify_file_integrity(dest_path, expected_size, None)
+        return
+
+    sha256 = hashlib.sha256()
+    with open(src_path, "rb") as fsrc, open(dest_path, "wb") as fdst:
+        for chunk in iter(lambda: fsrc.read(8 * 1024 * 1024), b""):
+            fdst.write(chunk)
+            sha256.update(chunk)
+    if status_cb:
+        status_cb("verifying")
+    _verify_file_integrity(dest_path, expected_size, None)
+    if sha256.hexdigest().lower() != expected_sha.lower():
+        raise RuntimeError("SHA256 mismatch")
+
+
 def run_download(parsed_data: dict,
                  final_folder: str,
                  sync: bool = False,
                  defer_verify: bool = False,
                  overwrite: bool = False,
                  return_info: bool = False,
-                 status_cb: Optional[Callable[[str], None]] = None) -> tuple:
+                 status_cb: Optional[Callable[[str], None]] = None,
+                 clear_cache: bool = True) -> tuple:
     """
     Downloads a single file from Hugging Face Hub and copies it to models/<final_folder>.
-    Cleans up the cached copy to save disk space.
+    Cleans up the cached copy to save disk space unless clear_cache is False, in which
+    case the cache path is reported as "cache_path" in the returned info.
     """
     token = get_token()
     print("[DEBUG] run_download (single-file) started")
@@ -209,7 +313,7 @@ def run_download(parsed_data: dict,
                     message = f"{file_name} already exists | {size_gb:.3f} GB"
                     print("[DEBUG]", message)
                     if return_info:
-                        return (message, dest_path, {"expected_size": expected_size, "expected_sha": expected_sha})
+                        return (message, dest_path, {"expected_size": expected_size, "expected_sha": expected_sha, "cache_path": None})
                     return (message, dest_path) if sync else ("", "")
                 except Exception as e:
                     print(f"[DEBUG] Existing file failed verification, re-downloading: {e}")
@@ -229,27 +333,30 @@ def run_download(parsed_data: dict,
 
         if status_cb:
             status_cb("copying")
-        shutil.copyfile(file_path_in_cache, dest_path)
-        print("[DEBUG] File copied to:", dest_path)
-
-        if not defer_verify:
+        if defer_verify:
+            shutil.copyfile(file_path_in_cache, dest_path)
+        else:
             try:
-                if status_cb:
-                    status_cb("verifying")
-                _verify_file_integrity(dest_path, expected_size, expected_sha)
+                _copy_and_hash(file_path_in_cache, dest_path, expected_size, expected_sha, status_cb)
             except Exception as e:
                 _safe_remove(dest_path)
                 raise RuntimeError(f"Download verification failed: {e}") from e
+        print("[DEBUG] File copied to:", dest_path)
 
-        if status_cb:
-            status_cb("cleaning_cache")
-        clear_cache_for_path(file_path_in_cache)
+        if clear_cache:
+            if status_cb:
+                status_cb("cleaning_cache")
+            clear_cache_for_path(file_path_in_cache)
 
         size_gb = os.path.getsize(dest_path) / (1024 ** 3)
         final_message = f"Downloaded {file_name} | {size_gb:.3f} GB"
         print("[DEBUG]", final_message)
         if return_info:
-            return (final_message, dest_path, {"expected_size": expected_size, "expected_sha": expected_sha})
+            return (final_message, dest_path, {
+                "expected_size": expected_size,
+                "expected_sha": expected_sha,
+                "cache_path": None if clear_cache else file_path_in_cache,
+            })
         return (final_message, dest_path) if sync else ("", "")
     except Exception as e:
         # Provide clearer feedback for common authentication/authorization problems
@@ -276,7 +383,8 @@ def run_download_folder(parsed_data: dict,
                         final_folder: str,
                         remote_subfolder_path: str = "",
                         last_segment: str = "",
-                        sync: bool = False) -> tuple[str, str]:
+                        sync: bool = False,
+                        clear_cache: bool = True) -> tuple[str, str]:
     """
     Downloads a folder or subfolder from Hugging Face Hub using snapshot_download.
     The result is placed in:
@@ -332,14 +440,24 @@ def run_download_folder(parsed_data: dict,
     def folder_monitor():
         nonlocal final_total, last_percent
         print("[DEBUG] Folder monitor started.")
+        ip = 0
         while not progress_event.is_set():
             csz = folder_size(temp_dir)
             pct = (csz / final_total) * 100 if final_total else 0
             ip = int(pct)
-            if ip > last_percent:
+            # Throttle console updates so the monitor doesn't fight the HF progress bar,
+            # but never skip reaching 100%.
+            if last_percent < 0 or ip - last_percent >= FOLDER_MONITOR_STEP_PERCENT or (ip >= 100 > last_percent):
                 print(f"\r[DEBUG] [Folder Monitor] {ip}%", end="")
                 last_percent = ip
             time.sleep(1)
+        if final_total:
+            # snapshot_download finished, so the folder is complete even if the
+            # last sample came before final_total was known.
+            ip = 100
+        if ip > last_percent:
+            # The monitor stopped between throttled updates; show where it ended.
+            print(f"\r[DEBUG] [Folder Monitor] {ip}%", end="")
         print()
 
     threading.Thread(target=folder_monitor, daemon=True).start()
@@ -348,6 +466,8 @@ def run_download_folder(parsed_data: dict,
         downloaded_folder = snapshot_download(**kwargs)
         print("[DEBUG] snapshot_download =>", downloaded_folder)
         final_total = folder_size(downloaded_folder)
+        # Stop sampling before the move below empties temp_dir.
+        progress_event.set()
     except Exception as e:
         progress_event.set()
         shutil.rmtree(temp_dir, ignore_errors=True)
@@ -364,17 +484,16 @@ def run_download_folder(parsed_data: dict,
             continue
         shutil.move(os.path.join(source_folder, item), os.path.join(dest_path, item))
 
-    elapsed = time.time() - time.time()
     fsz = folder_size(dest_path)
     fgb = fsz / (1024 ** 3)
     final_message = f"Folder downloaded: {os.path.basename(dest_path)} | {fgb:.3f} GB"
     print("[DEBUG]", final_message)
 
-    progress_event.set()
     shutil.rmtree(temp_dir, ignore_errors=True)
     print("[DEBUG] Removed temp folder:", temp_dir)
 
-    clear_cache_for_path(downloaded_folder)
+    if clear_cache:
+        clear_cache_for_path(downloaded_folder)
 
     return (final_message, dest_path) if sync else ("", "")
 
@@ -426,67 +545,100 @@ def download_repo_contents(parsed_data: dict, comfy_root: str, sync: bool = True
     """
     token = get_token()
     downloaded_paths = []
-    
+    # Tasks run concurrently against the same cached revision, so none of them may
+    # clear it; they record their cache paths here and the cache is cleared once at the end.
+    cache_paths = []
+
+    def _download_folder(folder: str) -> str:
+        folder_parsed = parsed_data.copy()
+        folder_parsed["subfolder"] = folder
+
+        message, folder_path = run_download_folder(
+            folder_parsed,
+            folder,  # Use the folder name as the final folder
+            remote_subfolder_path=folder,
+            sync=True,  # Always sync for better control
+            clear_cache=False,  # local_dir downloads do not populate the shared cache
+        )
+        if folder_path:
+            print(f"[INFO] Downloaded folder: {message}")
+        return folder_path
+
+    def _download_file(file: str) -> str:
+        file_parsed = parsed_data.copy()
+        file_parsed["file"] = file
+
+        if file == "custom_nodes.zip":
+            # Special handling for custom_nodes.zip
+            message, zip_path, info = run_download(
+                file_parsed,
+                "temp",  # Temporary location
+                sync=True,
+                return_info=True,
+                clear_cache=False,
+            )
+            if info.get("cache_path"):
+                cache_paths.append(info["cache_path"])
+            if not zip_path:
+                return ""
+            custom_nodes_dir = extract_custom_nodes(zip_path, comfy_root)
+            print(f"[INFO] Extracted custom_nodes.zip")
+            # Clean up the temporary zip file
+            try:
+                os.remove(zip_path)
+            except:
+                pass
+            return custom_nodes_dir
+
+        # Regular file download to root
+        message, file_path, info = run_download(
+            file_parsed,
+            "",  # Empty for root
+            sync=True,
+            return_info=True,
+            clear_cache=False,
+        )
+        if info.get("cache_path"):
+            cache_paths.append(info["cache_path"])
+        if file_path:
+            print(f"[INFO] Downloaded file: {message}")
+        return file_path
+
     try:
         folders, files = scan_repo_root(parsed_data["repo"], token)
         print(f"[INFO] Found {len(folders)} folders and {len(files)} files at root level")
-        
-        # First handle folders
-        for folder in folders:
-            if folder == ".git":  # Skip git metadata
-                continue
-                
-            folder_parsed = parsed_data.copy()
-            folder_parsed["subfolder"] = folder
-            
-            message, folder_path = run_download_folder(
-                folder_parsed,
-                folder,  # Use the folder name as the final folder
-                remote_subfolder_path=folder,
-                sync=True  # Always sync for better control
-            )
-            
-            if folder_path:
-                downloaded_paths.append(folder_path)
-                print(f"[INFO] Downloaded folder: {message}")
-        
-        # Then handle root files
-        for file in files:
-            if file == "custom_nodes.zip":
-                # Special handling for custom_nodes.zip
-                file_parsed = parsed_data.copy()
-                file_parsed["file"] = file
-                
-                message, zip_path = run_download(
-                    file_parsed,
-                    "temp",  # Temporary location
-                    sync=True
-                )
-                
-                if zip_path:
-                    custom_nodes_dir = extract_custom_nodes(zip_path, comfy_root)
-                    downloaded_paths.append(custom_nodes_dir)
-                    print(f"[INFO] Extracted custom_nodes.zip")
-                    # Clean up the temporary zip file
-                    try:
-                        os.remove(zip_path)
-                    except:
-                        pass
-            else:
-                # Regular file download to root
-                file_parsed = parsed_data.copy()
-                file_parsed["file"] = file
-                
-                message, file_path = run_download(
-                    file_parsed,
-                    "",  # Empty for root
-                    sync=True
+
+        # Root entries are independent, so download them concurrently; per-request
+        # latency dominates for repos with many small files.
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY) as ex:
+                futures = [
+                    ex.submit(_download_folder, folder)
+                    for folder in folders
+                    if folder != ".git"  # Skip git metadata
+                ]
+                futures.extend(ex.submit(_download_file, file) for file in files)
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_EXCEPTION
                 )
-                
-                if file_path:
-                    downloaded_paths.append(file_path)
-                    print(f"[INFO] Downloaded file: {message}")
-        
+                failed = next((fut for fut in futures if fut in done and fut.exception()), None)
+                if failed is not None:
+                    # Stop queued downloads instead of letting the executor's exit
+                    # wait for all of them; ones already running still finish.
+                    for fut in futures:
+                        fut.cancel()
+                    failed.result()
+                # Collect in submission order so downloaded_paths is deterministic.
+                for fut in futures:
+                    path = fut.result()
+                    if path:
+                        downloaded_paths.append(path)
+        finally:
+            # Root files share one snapshot folder; clear each revision once, after
+            # every download has finished reading from it.
+            for snapshot_path in dict.fromkeys(os.path.dirname(p) for p in cache_paths):
+                clear_cache_for_path(snapshot_path)
+
         final_message = f"Downloaded {len(downloaded_paths)} items from repository root"
         return (final_message, downloaded_paths) if sync else ("", [])
     except Exception as e:
@@ -500,9 +652,6 @@ def merge_and_update_yaml(repo_id: str, token: str, local_snapshot: dict, yaml_f
     Clean the `pips` section and upload the updated YAML file back to the repository.
     """
     try:
-        # Import HfApi here to avoid circular imports
-        from huggingface_hub import HfApi
-
         print("[DEBUG] Starting YAML merge process...")
 
         # Check if the YAML file exists in the repository
@@ -555,8 +704,7 @@ def merge_and_update_yaml(repo_id: str, token: str, local_snapshot: dict, yaml_f
         print(f"[DEBUG] Saved updated YAML to: {temp_path}")
 
         # Upload back to repo
-        api = HfApi()
-        api.upload_file(
+        _HF_API.upload_file(
             path_or_fileobj=temp_path,
             path_in_repo=yaml_filename,
             repo_id=repo_id,
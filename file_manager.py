@@ -1,16 +1,26 @@
 import os
 
+MODEL_FOLDER_PRIORITY = {
+    name: idx for idx, name in enumerate(
+        ("checkpoints", "clip", "diffusion_models", "vae", "loras", "controlnet")
+    )
+}
+
 def get_model_subfolders(models_dir: str = None) -> list:
     if models_dir is None:
         models_dir = os.path.join(os.getcwd(), "models")
     if not os.path.exists(models_dir):
         return []
-    subfolders = [name for name in os.listdir(models_dir)
-                  if os.path.isdir(os.path.join(models_dir, name))]
-    subfolders.sort()
-    priority = ["checkpoints", "clip", "diffusion_models", "vae", "loras", "controlnet"]
-    prio_list = [p for p in priority if p in subfolders]
-    non_prio = [f for f in subfolders if f not in priority]
+    prio_list = []
+    non_prio = []
+    with os.scandir(models_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            name = entry.name
+            (prio_list if name in MODEL_FOLDER_PRIORITY else non_prio).append(name)
+    prio_list.sort(key=MODEL_FOLDER_PRIORITY.__getitem__)
+    non_prio.sort()
     return prio_list + non_prio
 
 def get_all_subfolders_flat(root_dir: str = None) -> list:
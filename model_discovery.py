@@ -2,18 +2,32 @@ import os
 import re
 import json
 import time
+import random
+import functools
+import itertools
+import threading
 import concurrent.futures
 import urllib.request
 import urllib.error
 from typing import List, Dict, Any, Tuple
+from collections import Counter, OrderedDict, deque
 from types import SimpleNamespace
 from huggingface_hub import HfApi
 from .downloader import get_token
 from .parse_link import parse_link
 import folder_paths
 
+try:
+    import orjson  # Optional: much faster parsing of the large registry files.
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Known extensions for model files
 MODEL_EXTENSIONS = {'.safetensors', '.ckpt', '.pt', '.bin', '.pth', '.gguf'}
+# Tuple form for str.endswith, which checks all suffixes in one call.
+MODEL_EXTENSIONS_TUPLE = tuple(sorted(MODEL_EXTENSIONS))
+_URL_PREFIXES = ("http://", "https://")
 
 # Priority authors for HF search as requested
 PRIORITY_AUTHORS = [
@@ -28,16 +42,155 @@ PRIORITY_AUTHORS = [
     "black-forest-labs",
 ]
 
+class _TTLCache:
+    """
+    Small thread-safe mapping with per-entry TTL and an LRU size cap.
+    Expired entries behave as missing; the least recently used entry is evicted
+    once maxsize is exceeded.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live_item(self, key):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if self.ttl > 0 and item[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._live_item(key) is not None
+
+    def __getitem__(self, key):
+        with self._lock:
+            item = self._live_item(key)
+        if item is None:
+            raise KeyError(key)
+        return item[1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._live_item(key)
+        return default if item is None else item[1]
+
+    def __setitem__(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while self.maxsize > 0 and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def items(self) -> list:
+        """Snapshot of the live (key, value) pairs."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (expires, value) in self._data.items()
+                if self.ttl <= 0 or expires > now
+            ]
+
+    def expire(self) -> None:
+        """Drop every expired entry."""
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key in [k for k, (expires, _v) in self._data.items() if expires <= now]:
+                del self._data[key]
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: allows bursts of `capacity` calls and refills at
+    `rate` tokens per second.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = max(0.0, rate)
+        self.capacity = max(0, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.rate:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, n: int = 1) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < n:
+                return False
+            self._tokens -= n
+            return True
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tokens = float(self.capacity)
+            self._updated = time.monotonic()
+
+    def drain(self) -> None:
+        """Empty the bucket; calls resume at the sustained rate as it refills."""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+_CACHE_MISS = object()
+_SCAN_STOP = object()
+
+HF_CACHE_MAX_ENTRIES = int(os.getenv("HF_CACHE_MAX_ENTRIES", "1024"))
+HF_URL_CACHE_TTL = int(os.getenv("HF_URL_CACHE_TTL", "3600"))
+HF_REPO_CACHE_TTL = int(os.getenv("HF_REPO_CACHE_TTL", "1800"))
+HF_SEARCH_CACHE_TTL = int(os.getenv("HF_SEARCH_CACHE_TTL", "900"))
+
+# On-disk copy of found search results and repo listings, so a restart doesn't
+# repeat every HF call for workflows seen recently. 0 disables it.
+HF_DISK_CACHE_TTL = int(os.getenv("HF_DISK_CACHE_TTL", "86400"))
+HF_DISK_CACHE_FILE = os.getenv(
+    "HF_DISK_CACHE_FILE",
+    os.path.join(os.path.dirname(__file__), "cache", "hf_search_cache.json")
+)
+# Searches that found nothing are kept on disk too, but only briefly.
+HF_DISK_CACHE_NEGATIVE_TTL = int(os.getenv("HF_DISK_CACHE_NEGATIVE_TTL", "3600"))
+
 POPULAR_MODELS_FILE = os.path.join(os.path.dirname(__file__), "metadata", "popular-models.json")
 _popular_models_cache = None
 _manager_model_list_cache = None
-_hf_search_cache: dict[str, dict | None] = {}
-_hf_api_calls = 0
+_hf_search_cache = _TTLCache(HF_CACHE_MAX_ENTRIES, HF_SEARCH_CACHE_TTL)  # filename -> dict | None
 _hf_rate_limited_until = 0.0
+_hf_rate_limited_at = 0.0
 _hf_search_deadline = 0.0
 _hf_search_time_exhausted = False
-_hf_repo_files_cache: dict[str, list[str] | None] = {}
-_hf_url_exists_cache: dict[str, bool] = {}
+_hf_repo_files_cache = _TTLCache(HF_CACHE_MAX_ENTRIES, HF_REPO_CACHE_TTL)  # repo_id -> list[str]
+_hf_url_exists_cache = _TTLCache(HF_CACHE_MAX_ENTRIES, HF_URL_CACHE_TTL)  # url -> bool
+_hf_list_models_cache = _TTLCache(HF_CACHE_MAX_ENTRIES, HF_SEARCH_CACHE_TTL)  # (token, query) -> list
 _nunchaku_blackwell_cache: bool | None = None
 
 HF_SEARCH_MAX_CALLS = int(os.getenv("HF_SEARCH_MAX_CALLS", "200"))
@@ -46,6 +199,26 @@ HF_SEARCH_MAX_SECONDS = int(os.getenv("HF_SEARCH_MAX_SECONDS", "60"))
 HF_SEARCH_CALL_TIMEOUT = int(os.getenv("HF_SEARCH_CALL_TIMEOUT", "20"))
 PRIORITY_REPO_SCAN_LIMIT = int(os.getenv("HF_PRIORITY_REPO_SCAN_LIMIT", "100"))
 HF_URL_CHECK_TIMEOUT = int(os.getenv("HF_URL_CHECK_TIMEOUT", "8"))
+HF_URL_CHECK_CONCURRENCY = int(os.getenv("HF_URL_CHECK_CONCURRENCY", "8"))
+HF_SEARCH_WORKERS = max(1, int(os.getenv("HF_SEARCH_WORKERS", "16")))
+HF_REPO_SCAN_BATCH_SIZE = max(1, int(os.getenv("HF_REPO_SCAN_BATCH_SIZE", "8")))
+# Per-repo miss lines are the bulk of search logging; only print them on request.
+HF_SEARCH_VERBOSE = os.getenv("HF_SEARCH_VERBOSE", "0").strip().lower() in ("1", "true", "yes")
+HF_SEARCH_FILE_WORKERS = max(1, int(os.getenv("HF_SEARCH_FILE_WORKERS", "4")))
+MODEL_CHECK_WORKERS = max(1, int(os.getenv("HF_MODEL_CHECK_WORKERS", "8")))
+# Retries for HF metadata calls that fail with a 5xx, gateway timeout or
+# dropped connection; rate limits and our own call timeouts are not retried.
+HF_SEARCH_RETRIES = max(0, int(os.getenv("HF_SEARCH_RETRIES", "2")))
+# With this many files or fewer left for the priority repo scan, HEAD files no
+# cached listing holds at the root of priority repos not yet listed. 0 disables it.
+PRIORITY_PROBE_THRESHOLD = int(os.getenv("HF_PRIORITY_PROBE_THRESHOLD", "3"))
+
+# Each search stage may burst HF_SEARCH_MAX_CALLS calls, then is paced so the
+# sustained rate stays at HF_SEARCH_MAX_CALLS per HF_SEARCH_MAX_SECONDS.
+_hf_call_bucket = _TokenBucket(
+    rate=HF_SEARCH_MAX_CALLS / HF_SEARCH_MAX_SECONDS if HF_SEARCH_MAX_SECONDS > 0 else 0.0,
+    capacity=HF_SEARCH_MAX_CALLS
+)
 
 HF_SEARCH_SKIP_FILENAMES = {
     "pytorch_model.bin",
@@ -70,32 +243,398 @@ def is_timeout_error(err: Exception) -> bool:
     text = str(err).lower()
     return "timeout" in text or "timed out" in text or "gateway" in text or "504" in text or "524" in text
 
+_TRANSIENT_ERROR_MARKERS = (
+    "500 server error",
+    "502",
+    "503",
+    "connection aborted",
+    "connection reset",
+    "connection refused",
+    "max retries exceeded",
+    "temporarily unavailable",
+)
+
+def is_transient_error(err: Exception) -> bool:
+    """Server/network failures worth retrying. 429s and call_with_timeout expiry are not."""
+    if isinstance(err, (concurrent.futures.TimeoutError, HFSearchBudgetError)) or is_rate_limited_error(err):
+        return False
+    if is_timeout_error(err):
+        return True
+    text = str(err).lower()
+    return any(marker in text for marker in _TRANSIENT_ERROR_MARKERS)
+
+def _retry_delay(attempt: int) -> float:
+    """Exponential backoff with jitter: ~0.5s, 1s, 2s, ..."""
+    return 0.5 * (2 ** attempt) * random.uniform(0.8, 1.2)
+
+# Shared worker pool for HF API calls. A per-call executor would block on shutdown
+# until a hung call returned, defeating the timeout.
+_HF_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=HF_SEARCH_WORKERS,
+    thread_name_prefix="hf-search"
+)
+
+_hf_api_clients: dict[str | None, HfApi] = {}
+
+def _get_hf_api(token: str | None) -> HfApi:
+    """Return a process-wide HfApi per token so metadata calls reuse one client."""
+    api = _hf_api_clients.get(token)
+    if api is None:
+        api = _hf_api_clients.setdefault(token, HfApi(token=token))
+    return api
+
 def call_with_timeout(fn, *args, **kwargs):
-    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
-        fut = ex.submit(fn, *args, **kwargs)
+    fut = _HF_EXECUTOR.submit(fn, *args, **kwargs)
+    try:
         return fut.result(timeout=HF_SEARCH_CALL_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        # Drop the call if it never started; a running call finishes in the background.
+        fut.cancel()
+        raise
+
+def _with_hf_retry(fn, *args, **kwargs):
+    """
+    Call fn, retrying transient failures up to HF_SEARCH_RETRIES times with
+    backoff. Each retry needs search budget; without it the last error is raised.
+    """
+    for attempt in range(HF_SEARCH_RETRIES + 1):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= HF_SEARCH_RETRIES or not is_transient_error(e):
+                raise
+            delay = _retry_delay(attempt)
+            print(f"[DEBUG] Transient HF error ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+            if not _hf_search_allowed():
+                raise
+
+_inflight: dict[tuple[str, str], threading.Event] = {}
+_inflight_lock = threading.Lock()
+
+def _single_flight(inflight_key: tuple[str, str], cache: _TTLCache, cache_key: str, compute):
+    """
+    Return cache[cache_key], running compute() at most once across threads.
+    Concurrent callers for the same key wait for the running fetch and then read
+    the cache instead of issuing a duplicate HTTP call.
+    """
+    while True:
+        with _inflight_lock:
+            cached = cache.get(cache_key, _CACHE_MISS)
+            if cached is not _CACHE_MISS:
+                return cached
+            event = _inflight.get(inflight_key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                _inflight[inflight_key] = event
+        if leader:
+            try:
+                return compute()
+            finally:
+                with _inflight_lock:
+                    _inflight.pop(inflight_key, None)
+                event.set()
+        event.wait(timeout=HF_SEARCH_CALL_TIMEOUT)
+        # Leader finished (or failed without caching); re-check, possibly taking over.
+
+def _list_models_key(api: HfApi, query: dict) -> tuple:
+    return (getattr(api, "token", None),) + tuple(sorted(query.items()))
+
+def _list_models_cached(api: HfApi, **query) -> bool:
+    """
+    True when _list_models would answer query from memory. Callers skip the
+    search-budget charge for these, since no HF call is made.
+    """
+    return _hf_list_models_cache.get(_list_models_key(api, query), _CACHE_MISS) is not _CACHE_MISS
+
+def _list_models(api: HfApi, **query) -> list:
+    """
+    api.list_models through call_with_timeout, memoized per query. Similar
+    filenames in one workflow tend to issue the same search/author queries.
+    """
+    key = _list_models_key(api, query)
+    cached = _hf_list_models_cache.get(key, _CACHE_MISS)
+    if cached is not _CACHE_MISS:
+        return cached
+    models = _with_hf_retry(lambda: list(call_with_timeout(api.list_models, **query)))
+    _hf_list_models_cache[key] = models
+    return models
+
+_AUTHOR_MODELS_QUERY = {"limit": 100, "sort": "downloads", "direction": -1, "full": True}
+
+def _list_author_models(api: HfApi, author: str) -> list:
+    """
+    An author's top repos by downloads. Every author listing goes through this
+    one query shape, so they share a single _list_models cache entry per author.
+    full=True makes each ModelInfo carry its siblings, which prime
+    _hf_repo_files_cache so scanning those repos needs no list_repo_files call.
+    """
+    models = _list_models(api, author=author, **_AUTHOR_MODELS_QUERY)
+    for model in models:
+        model_id = getattr(model, "modelId", None)
+        siblings = getattr(model, "siblings", None)
+        if not model_id or not siblings or model_id in _hf_repo_files_cache:
+            continue
+        files = [s.rfilename for s in siblings if getattr(s, "rfilename", None)]
+        if files:
+            _hf_repo_files_cache[model_id] = files
+    return models
+
+_hf_disk_cache_data: dict[str, dict[str, list]] | None = None  # section -> key -> [saved_at, value]
+_hf_disk_cache_lock = threading.Lock()
+
+def _load_hf_disk_cache() -> dict[str, dict[str, list]]:
+    global _hf_disk_cache_data
+    if _hf_disk_cache_data is None:
+        data = {}
+        try:
+            if os.path.exists(HF_DISK_CACHE_FILE):
+                data = _load_json_file(HF_DISK_CACHE_FILE)
+        except Exception as e:
+            print(f"[DEBUG] Failed to read HF disk cache: {e}")
+        if not isinstance(data, dict):
+            data = {}
+        _hf_disk_cache_data = {
+            "search": data.get("search") or {},
+            "repo_files": data.get("repo_files") or {},
+        }
+    return _hf_disk_cache_data
+
+def _restore_hf_disk_cache() -> None:
+    """Seed the in-memory search and repo-listing caches from disk."""
+    if HF_DISK_CACHE_TTL <= 0:
+        return
+    now = time.time()
+    cutoff = now - HF_DISK_CACHE_TTL
+    negative_cutoff = now - HF_DISK_CACHE_NEGATIVE_TTL
+    with _hf_disk_cache_lock:
+        data = _load_hf_disk_cache()
+        for section, cache in (("search", _hf_search_cache), ("repo_files", _hf_repo_files_cache)):
+            entries = data[section]
+            expired = [
+                k for k, (saved_at, v) in entries.items()
+                if saved_at < (cutoff if v is not None else negative_cutoff)
+            ]
+            for key in expired:
+                del entries[key]
+            for key, (_saved_at, value) in entries.items():
+                if key not in cache:
+                    cache[key] = value
+
+def _save_hf_disk_cache() -> None:
+    """Persist search results (misses included) and non-empty repo listings."""
+    if HF_DISK_CACHE_TTL <= 0:
+        return
+    now = time.time()
+    with _hf_disk_cache_lock:
+        data = _load_hf_disk_cache()
+        changed = False
+        for section, cache, keep in (
+            ("search", _hf_search_cache, lambda v: (v is None and HF_DISK_CACHE_NEGATIVE_TTL > 0) or isinstance(v, dict)),
+            ("repo_files", _hf_repo_files_cache, bool),
+        ):
+            entries = data[section]
+            for key, value in cache.items():
+                saved = entries.get(key)
+                if keep(value) and (saved is None or saved[1] != value):
+                    entries[key] = [now, value]
+                    changed = True
+            if len(entries) > HF_CACHE_MAX_ENTRIES > 0:
+                newest = sorted(entries.items(), key=lambda kv: kv[1][0], reverse=True)
+                data[section] = dict(newest[:HF_CACHE_MAX_ENTRIES])
+                changed = True
+        if not changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(HF_DISK_CACHE_FILE), exist_ok=True)
+            tmp_path = HF_DISK_CACHE_FILE + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, HF_DISK_CACHE_FILE)
+        except Exception as e:
+            print(f"[DEBUG] Failed to write HF disk cache: {e}")
+
+def _get_repo_files(api: HfApi, repo_id: str, token: str | None, on_executor: bool = False) -> list[str]:
+    """
+    A repo's file listing via _hf_repo_files_cache, fetched at most once across
+    threads and retried on transient errors. on_executor is for the prefetchers
+    that submit this to _HF_EXECUTOR themselves: they charge the search budget
+    at submit time and wait with their own timeout, so the call runs inline.
+    """
+    return _single_flight(
+        ("repo", repo_id),
+        _hf_repo_files_cache,
+        repo_id,
+        lambda: _fetch_repo_files(api, repo_id, token, on_executor)
+    )
 
-def _get_repo_files(api: HfApi, repo_id: str, token: str | None) -> list[str]:
-    if repo_id in _hf_repo_files_cache:
-        return _hf_repo_files_cache[repo_id] or []
-    if not _hf_search_allowed():
+def _fetch_repo_files(api: HfApi, repo_id: str, token: str | None, on_executor: bool = False) -> list[str]:
+    if not on_executor and not _hf_search_allowed():
         raise HFSearchBudgetError()
     try:
-        files = call_with_timeout(api.list_repo_files, repo_id=repo_id, token=token)
-    except Exception:
-        _hf_repo_files_cache[repo_id] = []
+        if on_executor:
+            files = _with_hf_retry(api.list_repo_files, repo_id=repo_id, token=token)
+        else:
+            files = _with_hf_retry(call_with_timeout, api.list_repo_files, repo_id=repo_id, token=token)
+    except Exception as e:
+        # Failures are cached as empty listings, except rate limits: those repos
+        # stay uncached so they can be listed once the pause is over.
+        if not is_rate_limited_error(e):
+            _hf_repo_files_cache[repo_id] = []
         raise
     _hf_repo_files_cache[repo_id] = files or []
     return files or []
 
+_repo_basename_indexes: dict[str, tuple[list[str], dict[str, str]]] = {}
+
+def _repo_basename_index(repo_id: str, files: list[str]) -> dict[str, str]:
+    """
+    {basename_lower: first matching path} for a repo listing, rebuilt only when
+    the cached listing object changes, so probing several filenames against the
+    same repo doesn't rescan it each time.
+    """
+    cached = _repo_basename_indexes.get(repo_id)
+    if cached is not None and cached[0] is files:
+        return cached[1]
+    index: dict[str, str] = {}
+    basename = os.path.basename
+    for f in files:
+        index.setdefault(basename(f).lower(), f)
+    _repo_basename_indexes[repo_id] = (files, index)
+    return index
+
+def _get_repo_files_batch(api: HfApi, repo_ids: list[str], token: str | None) -> None:
+    """
+    Prefetch file listings for several repos concurrently into _hf_repo_files_cache,
+    through _get_repo_files so dedup, retries and caching match; a rate limit pauses
+    further searching so per-repo callers stop on their next budget check.
+    """
+    futures: dict[concurrent.futures.Future, str] = {}
+    for repo_id in dict.fromkeys(repo_ids):
+        if repo_id in _hf_repo_files_cache:
+            continue
+        if not _hf_search_allowed():
+            break
+        fut = _HF_EXECUTOR.submit(_get_repo_files, api, repo_id, token, True)
+        futures[fut] = repo_id
+    if not futures:
+        return
+
+    deadline = time.monotonic() + HF_SEARCH_CALL_TIMEOUT
+    not_done = set(futures)
+    while not_done:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, not_done = concurrent.futures.wait(
+            not_done,
+            timeout=remaining,
+            return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        rate_limited = False
+        for fut in done:
+            repo_id = futures[fut]
+            # _get_repo_files has already cached the listing (or the failure).
+            e = fut.exception()
+            if e is not None:
+                if is_rate_limited_error(e):
+                    _set_hf_rate_limited(e)
+                    rate_limited = True
+                else:
+                    print(f"[DEBUG] list_repo_files failed for {repo_id}: {e}")
+        if rate_limited:
+            # Drop the rest of the wave that hasn't started yet; those repos stay
+            # uncached so they can be listed once the pause is over.
+            for fut in not_done:
+                fut.cancel()
+            return
+    for fut in not_done:
+        repo_id = futures[fut]
+        _hf_repo_files_cache[repo_id] = []
+        print(f"[DEBUG] list_repo_files timeout for {repo_id} (batch prefetch)")
+
+def _iter_repo_files(api: HfApi, repo_ids: list[str], token: str | None):
+    """
+    Yield (repo_id, files, error) for repo_ids in order, keeping up to
+    HF_REPO_SCAN_BATCH_SIZE listings in flight so a slow repo only delays its
+    own turn rather than a whole wave. Cached listings cost no call. Running out
+    of budget yields HFSearchBudgetError and ends the iteration. Closing the
+    generator cancels listings that haven't started.
+    """
+    ids = iter(dict.fromkeys(repo_ids))
+    queue: deque = deque()
+    in_flight = 0
+    budget_stop = False
+
+    def fill() -> None:
+        nonlocal in_flight, budget_stop
+        while not budget_stop and in_flight < HF_REPO_SCAN_BATCH_SIZE:
+            repo_id = next(ids, None)
+            if repo_id is None:
+                return
+            if repo_id in _hf_repo_files_cache:
+                queue.append((repo_id, None))
+                continue
+            if not _hf_search_allowed():
+                budget_stop = True
+                queue.append((repo_id, HFSearchBudgetError()))
+                return
+            # _get_repo_files caches the result, so a listing finished after the
+            # caller gave up on it is still kept.
+            fut = _HF_EXECUTOR.submit(_get_repo_files, api, repo_id, token, True)
+            queue.append((repo_id, fut))
+            in_flight += 1
+
+    try:
+        fill()
+        while queue:
+            repo_id, pending = queue.popleft()
+            if pending is None:
+                yield repo_id, _hf_repo_files_cache.get(repo_id) or [], None
+            elif isinstance(pending, Exception):
+                yield repo_id, [], pending
+                return
+            else:
+                in_flight -= 1
+                fill()
+                try:
+                    files = pending.result(timeout=HF_SEARCH_CALL_TIMEOUT) or []
+                except concurrent.futures.TimeoutError as e:
+                    pending.cancel()
+                    if repo_id not in _hf_repo_files_cache:
+                        _hf_repo_files_cache[repo_id] = []
+                    yield repo_id, [], e
+                    continue
+                except Exception as e:
+                    yield repo_id, [], e
+                    continue
+                yield repo_id, files, None
+            fill()
+    finally:
+        for _repo_id, pending in queue:
+            if isinstance(pending, concurrent.futures.Future):
+                pending.cancel()
+
+# Pattern: https://huggingface.co/{repo}/resolve/{rev}/{path}
+_HF_FILE_URL_RE = re.compile(r'huggingface\.co/([^/]+/[^/]+)/(?:resolve|blob)/[^/]+/(.+?)(?:\?|$)')
+_FILENAME_SEPARATORS_RE = re.compile(r'[-_]+')
+_NAME_TOKEN_SPLIT_RE = re.compile(r'[-_]')
+_DIGITS_RE = re.compile(r'\d+')
+# Markdown links in Note widgets: [label](url)
+_NOTE_LINK_RE = re.compile(r'\[([^\]]+)\]\((https?://[^)]+)\)', re.IGNORECASE)
+_SUBGRAPH_UUID_RE = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
+    re.IGNORECASE
+)
+
+@functools.lru_cache(maxsize=4096)
 def extract_huggingface_info(url: str) -> tuple[str | None, str | None]:
     """Extract HuggingFace repo and file path from a resolve/blob URL."""
     if not url or "huggingface.co" not in url:
         return None, None
 
-    # Pattern: https://huggingface.co/{repo}/resolve/{rev}/{path}
-    pattern = r'huggingface\.co/([^/]+/[^/]+)/(?:resolve|blob)/[^/]+/(.+?)(?:\?|$)'
-    match = re.search(pattern, url)
+    match = _HF_FILE_URL_RE.search(url)
     if not match:
         return None, None
     return match.group(1), match.group(2)
@@ -130,7 +669,7 @@ def is_specific_model_file_url(url: str, expected_filename: str | None = None) -
     file_name = os.path.basename(hf_path.replace("\\", "/")).strip()
     if not file_name:
         return False
-    if not any(file_name.lower().endswith(ext) for ext in MODEL_EXTENSIONS):
+    if not file_name.lower().endswith(MODEL_EXTENSIONS_TUPLE):
         return False
 
     if expected_filename:
@@ -148,13 +687,15 @@ def normalize_save_path(save_path: str | None) -> str | None:
         normalized = normalized.split("/", 1)[1]
     return normalized or None
 
+@functools.lru_cache(maxsize=4096)
 def normalize_filename_key(name: str) -> str:
     base = os.path.basename(name.replace("\\", "/")).strip()
     return base.lower()
 
+@functools.lru_cache(maxsize=4096)
 def normalize_filename_compact(name: str) -> str:
     base = normalize_filename_key(name)
-    return re.sub(r'[-_]+', '', base)
+    return _FILENAME_SEPARATORS_RE.sub('', base)
 
 def split_model_identifier(value: str) -> Tuple[str, str | None]:
     normalized = value.replace("\\", "/").strip()
@@ -168,13 +709,20 @@ def _is_nunchaku_svdq_name(value: str | None) -> bool:
     lowered = value.lower()
     return "svdq-" in lowered and ("int4" in lowered or "fp4" in lowered)
 
+_NUNCHAKU_INT4_RE = re.compile(r'(?<![a-z0-9])int4(?![a-z0-9])', re.IGNORECASE)
+_NUNCHAKU_FP4_RE = re.compile(r'(?<![a-z0-9])fp4(?![a-z0-9])', re.IGNORECASE)
+
 def _swap_nunchaku_precision(value: str, target_precision: str) -> str:
     if not value:
         return value
     if target_precision == "fp4":
-        return re.sub(r'(?<![a-z0-9])int4(?![a-z0-9])', "fp4", value, flags=re.IGNORECASE)
+        if "int4" not in value.lower():
+            return value
+        return _NUNCHAKU_INT4_RE.sub("fp4", value)
     if target_precision == "int4":
-        return re.sub(r'(?<![a-z0-9])fp4(?![a-z0-9])', "int4", value, flags=re.IGNORECASE)
+        if "fp4" not in value.lower():
+            return value
+        return _NUNCHAKU_FP4_RE.sub("int4", value)
     return value
 
 def _is_nunchaku_extensionless_identifier(value: str | None) -> bool:
@@ -184,12 +732,19 @@ def _is_nunchaku_extensionless_identifier(value: str | None) -> bool:
     stem, ext = os.path.splitext(base)
     return _is_nunchaku_svdq_name(base) and not ext
 
+def _url_basename(url: str) -> str:
+    """Last path segment of a URL, ignoring any query string."""
+    return url.partition("?")[0].rpartition("/")[2]
+
 def _looks_like_model_widget_value(value: str, node_type: str) -> bool:
-    if any(value.endswith(ext) for ext in MODEL_EXTENSIONS):
-        return True
-    if "nunchaku" in (node_type or "").lower() and _is_nunchaku_svdq_name(value):
+    if value.endswith(MODEL_EXTENSIONS_TUPLE):
         return True
-    return False
+    return "nunchaku" in (node_type or "").lower() and _is_nunchaku_svdq_name(value)
+
+def _load_json_file(path: str) -> Any:
+    """Read a JSON file as bytes and parse it with orjson when available."""
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
 
 def load_popular_models_registry() -> dict:
     """Load curated popular-models.json registry."""
@@ -202,8 +757,7 @@ def load_popular_models_registry() -> dict:
         return _popular_models_cache
 
     try:
-        with open(POPULAR_MODELS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _load_json_file(POPULAR_MODELS_FILE)
         models = data.get("models", {})
     except Exception as e:
         print(f"[ERROR] Failed to load popular models registry: {e}")
@@ -245,13 +799,22 @@ def _iter_registry_urls(entry: dict) -> list[str]:
         deduped.append(url)
     return deduped
 
+try:
+    import urllib3
+    # Keep-alive pool for URL probes; nearly all of them hit huggingface.co.
+    _url_probe_pool = urllib3.PoolManager(num_pools=4, maxsize=max(1, HF_URL_CHECK_CONCURRENCY))
+    # Follow up to 3 redirects, no other retries; the final 3xx is returned, not raised.
+    _url_probe_redirects = urllib3.Retry(total=3, connect=0, read=0, status=0, redirect=3, raise_on_redirect=False)
+except ImportError:
+    _url_probe_pool = None
+    _url_probe_redirects = None
+
 def _hf_url_exists(url: str) -> bool:
     if not url or "huggingface.co" not in url:
         return False
-    cached = _hf_url_exists_cache.get(url)
-    if cached is not None:
-        return cached
+    return _single_flight(("url", url), _hf_url_exists_cache, url, lambda: _probe_hf_url(url))
 
+def _probe_hf_url(url: str) -> bool:
     headers = {
         "User-Agent": "ComfyUI-HuggingFace-Downloader/1.0",
         "Accept": "*/*",
@@ -261,29 +824,78 @@ def _hf_url_exists(url: str) -> bool:
         req_headers = dict(headers)
         if extra_headers:
             req_headers.update(extra_headers)
+        if _url_probe_pool is not None:
+            # HF's resolve -> CDN redirect carries the linked blob's etag, which
+            # already proves the file exists and skips a second TLS handshake.
+            # Any other redirect (renamed repo, ...) is followed and checked.
+            resp = _url_probe_pool.request(
+                method,
+                url,
+                headers=req_headers,
+                timeout=HF_URL_CHECK_TIMEOUT,
+                retries=False
+            )
+            if 300 <= resp.status < 400:
+                if resp.headers.get("X-Linked-Etag"):
+                    return True
+                resp = _url_probe_pool.request(
+                    method,
+                    url,
+                    headers=req_headers,
+                    timeout=HF_URL_CHECK_TIMEOUT,
+                    retries=_url_probe_redirects
+                )
+            if resp.status >= 400:
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+            return 200 <= resp.status < 300
         req = urllib.request.Request(url, method=method, headers=req_headers)
         with urllib.request.urlopen(req, timeout=HF_URL_CHECK_TIMEOUT) as resp:
             code = getattr(resp, "status", None) or resp.getcode()
             return 200 <= int(code) < 400
 
     ok = False
-    try:
-        ok = _request("HEAD")
-    except urllib.error.HTTPError as e:
-        # Some endpoints disallow HEAD. Try a tiny ranged GET before giving up.
-        if e.code in (401, 403, 405):
-            try:
-                ok = _request("GET", {"Range": "bytes=0-0"})
-            except Exception:
+    # A 5xx or network error says nothing about the file: retry once, and don't
+    # cache the answer if it still fails.
+    for attempt in range(min(HF_SEARCH_RETRIES, 1) + 1):
+        transient = False
+        try:
+            ok = _request("HEAD")
+        except urllib.error.HTTPError as e:
+            # Some endpoints disallow HEAD. Try a tiny ranged GET before giving up.
+            if e.code in (401, 403, 405):
+                try:
+                    ok = _request("GET", {"Range": "bytes=0-0"})
+                except Exception:
+                    ok = False
+            else:
                 ok = False
-        else:
+                transient = e.code >= 500
+        except Exception:
             ok = False
-    except Exception:
-        ok = False
-
-    _hf_url_exists_cache[url] = ok
+            transient = True
+        if not transient:
+            break
+        if attempt < min(HF_SEARCH_RETRIES, 1):
+            time.sleep(_retry_delay(attempt))
+
+    if not transient:
+        _hf_url_exists_cache[url] = ok
     return ok
 
+def _hf_urls_exist(urls: list[str]) -> dict[str, bool]:
+    """Probe several URLs concurrently, filling _hf_url_exists_cache in one pass."""
+    pending = list(dict.fromkeys(
+        url for url in urls
+        if url and "huggingface.co" in url and url not in _hf_url_exists_cache
+    ))
+    probed: dict[str, bool] = {}
+    if len(pending) > 1 and HF_URL_CHECK_CONCURRENCY > 1:
+        workers = min(HF_URL_CHECK_CONCURRENCY, len(pending))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
+            probed = dict(zip(pending, ex.map(_hf_url_exists, pending)))
+    # Results that weren't cached (transient failures) are reused, not re-probed.
+    return {url: probed[url] if url in probed else _hf_url_exists(url) for url in urls}
+
 def _preferred_nunchaku_precision() -> str:
     """
     Match ComfyUI-nunchaku logic:
@@ -304,27 +916,63 @@ def _preferred_nunchaku_precision() -> str:
         _nunchaku_blackwell_cache = is_blackwell
     return "fp4" if _nunchaku_blackwell_cache else "int4"
 
+_registry_index_cache: dict[int, tuple[dict, SimpleNamespace]] = {}
+
+def _get_registry_index(model_map: dict) -> SimpleNamespace:
+    """
+    Build secondary indexes for a {filename_lower: entry} registry in one pass,
+    cached per registry object:
+      - by_stem: extensionless prefix -> shortest key starting with "<prefix>."
+      - by_canon_quant: canonical base -> [(filename, filename_lower, entry)] for
+        quantized, non-GGUF/SVDQ entries
+    """
+    cached = _registry_index_cache.get(id(model_map))
+    if cached is not None and cached[0] is model_map:
+        return cached[1]
+
+    by_stem: dict[str, str] = {}
+    by_canon_quant: dict[str, list[tuple[str, str, dict]]] = {}
+    for key, entry in model_map.items():
+        prefixes = [key]
+        dot = key.find(".")
+        while dot != -1:
+            prefixes.append(key[:dot])
+            dot = key.find(".", dot + 1)
+        for prefix in prefixes:
+            current = by_stem.get(prefix)
+            if current is None or len(key) < len(current):
+                by_stem[prefix] = key
+
+        entry_name = entry.get("filename")
+        if not entry_name:
+            continue
+        entry_lower = entry_name.lower()
+        if entry_lower.endswith(".gguf") or "svdq" in entry_lower:
+            continue
+        if not is_quant_variant_filename(entry_lower):
+            continue
+        by_canon_quant.setdefault(canonicalize_model_base(entry_lower), []).append(
+            (entry_name, entry_lower, entry)
+        )
+
+    index = SimpleNamespace(by_stem=by_stem, by_canon_quant=by_canon_quant)
+    _registry_index_cache[id(model_map)] = (model_map, index)
+    return index
+
 def _lookup_popular_entry(popular_models: dict, filename: str) -> dict | None:
     key = (filename or "").lower()
     if not key:
         return None
-    entry = popular_models.get(key) or popular_models.get(os.path.basename(key))
+    base = key.rpartition("/")[2] if "/" in key else key
+    entry = popular_models.get(key) or popular_models.get(base)
     if entry:
         return entry
 
-    base = os.path.basename(key)
-    _stem, ext = os.path.splitext(base)
-    if ext:
+    if os.path.splitext(base)[1]:
         return None
 
-    candidates = []
-    for k, v in popular_models.items():
-        if k == base or k.startswith(base + "."):
-            candidates.append((k, v))
-    if not candidates:
-        return None
-    candidates.sort(key=lambda kv: len(kv[0]))
-    return candidates[0][1]
+    match = _get_registry_index(popular_models).by_stem.get(base)
+    return popular_models.get(match) if match is not None else None
 
 def load_comfyui_manager_model_list() -> dict:
     """Load ComfyUI Manager model-list.json from known locations."""
@@ -345,19 +993,19 @@ def load_comfyui_manager_model_list() -> dict:
         os.path.join(comfy_root, "user", "default", "ComfyUI-Manager", "model-list.json"),
     ]
 
+    candidate_files = [path for path in candidate_files if os.path.exists(path)]
     for cache_dir in cache_dirs:
-        if not os.path.exists(cache_dir):
+        try:
+            with os.scandir(cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith("model-list.json") and entry.is_file():
+                        candidate_files.append(entry.path)
+        except OSError:
             continue
-        for file in os.listdir(cache_dir):
-            if file.endswith("model-list.json"):
-                candidate_files.append(os.path.join(cache_dir, file))
 
     for path in candidate_files:
-        if not os.path.exists(path):
-            continue
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = _load_json_file(path)
             for model in data.get("models", []):
                 filename = model.get("filename")
                 url = model.get("url", "")
@@ -390,24 +1038,28 @@ def enrich_model_with_url(model: Dict[str, Any], url: str, source: str, director
         model["hf_path"] = hf_path
     print(f"[DEBUG] Found URL for {model.get('filename')} via {source}: {url}")
 
+_QUANT_VARIANT_RE = re.compile(
+    r'(?:^|[-_])(?:fp8[-_]?e4m3fn|fp(?:16|32|8|4)|bf16|nf4|int(?:8|4))(?:$|[-_])'
+)
+# Applied in order: stripping is sequential, so e.g. `_int8_bf16` loses both suffixes.
+_QUANT_SUFFIX_RES = (
+    re.compile(r'[-_]?fp8[-_]?e4m3fn$'),
+    re.compile(r'[-_]?fp(?:16|32|8|4)$'),
+    re.compile(r'[-_]?bf16$'),
+    re.compile(r'[-_]?nf4$'),
+    re.compile(r'[-_]?int(?:8|4)$'),
+)
+
+@functools.lru_cache(maxsize=4096)
 def is_quant_variant_filename(filename: str) -> bool:
     name = os.path.splitext(filename.lower())[0]
-    quant_patterns = [
-        r'(^|[-_])fp8[-_]?e4m3fn($|[-_])',
-        r'(^|[-_])fp(16|32|8|4)($|[-_])',
-        r'(^|[-_])bf16($|[-_])',
-        r'(^|[-_])nf4($|[-_])',
-        r'(^|[-_])int(8|4)($|[-_])',
-    ]
-    return any(re.search(p, name) for p in quant_patterns)
+    return _QUANT_VARIANT_RE.search(name) is not None
 
+@functools.lru_cache(maxsize=4096)
 def canonicalize_model_base(filename: str) -> str:
     base = os.path.splitext(filename.lower())[0]
-    base = re.sub(r'[-_]?fp8[-_]?e4m3fn$', '', base)
-    base = re.sub(r'[-_]?fp(16|32|8|4)$', '', base)
-    base = re.sub(r'[-_]?bf16$', '', base)
-    base = re.sub(r'[-_]?nf4$', '', base)
-    base = re.sub(r'[-_]?int(8|4)$', '', base)
+    for pattern in _QUANT_SUFFIX_RES:
+        base = pattern.sub('', base)
     return base
 
 def find_quantized_alternatives(filename: str, registries: list[tuple[str, dict]]) -> list[Dict[str, Any]]:
@@ -423,19 +1075,9 @@ def find_quantized_alternatives(filename: str, registries: list[tuple[str, dict]
     seen = set()
 
     for source, model_map in registries:
-        for entry in model_map.values():
-            entry_name = entry.get("filename")
-            if not entry_name:
-                continue
-            entry_lower = entry_name.lower()
+        for entry_name, entry_lower, entry in _get_registry_index(model_map).by_canon_quant.get(base, ()):
             if entry_lower in seen or entry_lower == filename_lower:
                 continue
-            if entry_lower.endswith(".gguf") or "svdq" in entry_lower:
-                continue
-            if canonicalize_model_base(entry_name) != base:
-                continue
-            if not is_quant_variant_filename(entry_name):
-                continue
 
             alt = {
                 "filename": entry_name,
@@ -487,10 +1129,22 @@ def load_comfyui_manager_cache(missing_models: List[Dict[str, Any]], status_cb=N
 
     return missing_models
 
+_local_models_cache: dict[str, tuple[Dict[str, str], dict[str, int]]] = {}
+
+def _dir_mtimes_unchanged(dir_mtimes: dict[str, int]) -> bool:
+    for path, mtime in dir_mtimes.items():
+        try:
+            if os.stat(path).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
 def get_all_local_models(comfy_root: str) -> Dict[str, str]:
     """
     Scans the 'models' directory and returns a dictionary:
     { "filename.ext": "relative/path/to/filename.ext" }
+    The result is reused until the mtime of any scanned directory changes.
     """
     models_dir = os.path.join(comfy_root, "models")
     model_map = {}
@@ -498,20 +1152,40 @@ def get_all_local_models(comfy_root: str) -> Dict[str, str]:
     if not os.path.exists(models_dir):
         return model_map
 
-    for root, _, files in os.walk(models_dir):
-        for file in files:
-            if any(file.endswith(ext) for ext in MODEL_EXTENSIONS):
-                # storage relative path from comfy root
-                full_path = os.path.join(root, file)
-                rel_path = os.path.relpath(full_path, comfy_root)
-                model_map[file] = rel_path
-                
-    return model_map
+    cached = _local_models_cache.get(comfy_root)
+    if cached is not None and _dir_mtimes_unchanged(cached[1]):
+        return dict(cached[0])
+
+    # Iterative scandir walk in os.walk's top-down order, so later duplicates still win.
+    # Directory mtimes change whenever an entry is added, removed or renamed, so
+    # recording them is enough to validate the cache without re-listing files.
+    dir_mtimes: dict[str, int] = {}
+    stack = [models_dir]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        try:
+            dir_mtimes[current] = os.stat(current).st_mtime_ns
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.endswith(MODEL_EXTENSIONS_TUPLE) and entry.is_file():
+                            # storage relative path from comfy root
+                            model_map[entry.name] = os.path.relpath(entry.path, comfy_root)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+    _local_models_cache[comfy_root] = (model_map, dir_mtimes)
+    return dict(model_map)
 
 # Mapping of node types to default model subfolders
 NODE_TYPE_MAPPING = {
     "UNETLoader": "diffusion_models",
-    "UnetLoaderGGUF": "diffusion_models",
     "LoraLoader": "loras",
     "LoraLoaderModelOnly": "loras",
     "VAELoader": "vae",
@@ -528,10 +1202,7 @@ NODE_TYPE_MAPPING = {
     "GligenLoader": "gligen",
     "DiffusersLoader": "diffusion_models",
     "GLIGENLoader": "gligen",
-    "CLIPVisionLoader": "clip_vision",
-    "StyleModelLoader": "style_models",
-    "DiffControlNetLoader": "controlnet",
-    
+
     # External Repos / Custom Nodes
     
     # ComfyUI-WanVideoWrapper
@@ -590,14 +1261,17 @@ NODE_TYPE_MAPPING = {
 
 
 def _build_links_map(raw_links: list[Any]) -> dict:
-    links_map = {}
+    # Array-form links ([id, origin_id, origin_slot, target_id, ...]) are the
+    # common case; map them in one comprehension and loop only for object-form.
+    links_map = {
+        link[0]: (link[1], link[2])
+        for link in raw_links
+        if isinstance(link, list) and len(link) >= 4
+    }
+    if len(links_map) == len(raw_links):
+        return links_map
     for link in raw_links:
-        if isinstance(link, list) and len(link) >= 4:
-            link_id = link[0]
-            start_node_id = link[1]
-            start_slot = link[2]
-            links_map[link_id] = (start_node_id, start_slot)
-        elif isinstance(link, dict):
+        if isinstance(link, dict):
             link_id = link.get("id")
             start_node_id = link.get("origin_id")
             start_slot = link.get("origin_slot")
@@ -605,36 +1279,47 @@ def _build_links_map(raw_links: list[Any]) -> dict:
                 links_map[link_id] = (start_node_id, start_slot)
     return links_map
 
-def resolve_node_folder(node: dict) -> str | None:
-    node_type = node.get("type", "")
-    if node_type in NODE_TYPE_MAPPING:
-        return NODE_TYPE_MAPPING[node_type]
-
-    properties = node.get("properties") or {}
-    cnr_id = (properties.get("cnr_id") or "").lower()
+# Keyword -> folder rules for loader families not listed in NODE_TYPE_MAPPING,
+# checked in order against the lowercased node type.
+_GGUF_FOLDER_RULES = (
+    ("clip", "text_encoders"),
+    ("vae", "vae"),
+    ("lora", "loras"),
+)
+_KJNODES_FOLDER_RULES = _GGUF_FOLDER_RULES + (
+    ("unet", "diffusion_models"),
+    ("model", "diffusion_models"),
+)
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_node_type_folder(node_type: str, cnr_id: str) -> str | None:
     node_type_lower = node_type.lower()
 
     if "gguf" in node_type_lower or "gguf" in cnr_id:
-        if "clip" in node_type_lower:
-            return "text_encoders"
-        if "vae" in node_type_lower:
-            return "vae"
-        if "lora" in node_type_lower:
-            return "loras"
+        for keyword, folder in _GGUF_FOLDER_RULES:
+            if keyword in node_type_lower:
+                return folder
         return "diffusion_models"
 
     if "kjnodes" in cnr_id:
-        if "clip" in node_type_lower:
-            return "text_encoders"
-        if "vae" in node_type_lower:
-            return "vae"
-        if "lora" in node_type_lower:
-            return "loras"
-        if "unet" in node_type_lower or "model" in node_type_lower:
-            return "diffusion_models"
+        for keyword, folder in _KJNODES_FOLDER_RULES:
+            if keyword in node_type_lower:
+                return folder
 
     return None
 
+def resolve_node_folder(node: dict) -> str | None:
+    node_type = node.get("type", "")
+    folder = NODE_TYPE_MAPPING.get(node_type)
+    if folder is not None:
+        return folder
+
+    properties = node.get("properties") or {}
+    cnr_id = (properties.get("cnr_id") or "").lower()
+    # Workflows repeat the same handful of node types, so the keyword rules are
+    # evaluated once per (type, cnr_id) pair.
+    return _resolve_node_type_folder(node_type, cnr_id)
+
 def resolve_proxy_widget_folder(widget_name: str | None) -> str | None:
     if not widget_name:
         return None
@@ -675,9 +1360,9 @@ def collect_proxy_widget_models(
             continue
         if not isinstance(value, str):
             continue
-        if value.startswith("http://") or value.startswith("https://"):
-            parsed_filename = value.split("?")[0].split("/")[-1]
-            if not any(parsed_filename.endswith(ext) for ext in MODEL_EXTENSIONS):
+        if value.startswith(_URL_PREFIXES):
+            parsed_filename = _url_basename(value)
+            if not parsed_filename.endswith(MODEL_EXTENSIONS_TUPLE):
                 continue
             suggested_folder = resolve_proxy_widget_folder(widget_name)
             results.append({
@@ -688,7 +1373,7 @@ def collect_proxy_widget_models(
                 "origin": "proxy_widget"
             })
             continue
-        if not any(value.endswith(ext) for ext in MODEL_EXTENSIONS):
+        if not value.endswith(MODEL_EXTENSIONS_TUPLE):
             continue
         filename, requested_path = split_model_identifier(value)
         suggested_folder = resolve_proxy_widget_folder(widget_name)
@@ -701,6 +1386,32 @@ def collect_proxy_widget_models(
         })
     return results
 
+def _node_may_reference_models(node: dict, node_type: str) -> bool:
+    """
+    Cheap pre-filter: False only when none of the collection branches below could
+    record a model or note link for this node, so most non-loader nodes skip the
+    per-node bookkeeping entirely.
+    """
+    if (
+        node_type == "Hugging Face Download Model"
+        or "Note" in node_type
+        or "PrimitiveString" in node_type
+        or is_subgraph_node(node_type)
+    ):
+        return True
+    properties = node.get("properties")
+    if isinstance(properties, dict) and "models" in properties:
+        return True
+    widgets = node.get("widgets_values")
+    if not isinstance(widgets, list):
+        return False
+    for val in widgets:
+        if not isinstance(val, str):
+            continue
+        if val.startswith(_URL_PREFIXES) or _looks_like_model_widget_value(val, node_type):
+            return True
+    return False
+
 def _collect_models_from_nodes(
     nodes: list[dict],
     links_map: dict,
@@ -710,6 +1421,19 @@ def _collect_models_from_nodes(
     note_links_normalized: dict,
     node_title_fallback: str
 ) -> None:
+    # (node_id, filename) pairs already recorded, and entries grouped by node, so
+    # duplicate checks and upstream URL enrichment don't rescan found_models.
+    seen_pairs = set()
+    models_by_node = {}
+    for m in found_models:
+        seen_pairs.add((m["node_id"], m["filename"]))
+        models_by_node.setdefault(m["node_id"], []).append(m)
+
+    def _add_model(entry: dict) -> None:
+        found_models.append(entry)
+        seen_pairs.add((entry["node_id"], entry["filename"]))
+        models_by_node.setdefault(entry["node_id"], []).append(entry)
+
     for node in nodes:
         # Skip disabled/muted nodes
         # 0 = Enabled, 2 = Muted, 4 = Bypass/Disabled?
@@ -724,8 +1448,11 @@ def _collect_models_from_nodes(
         if node.get("mode") == 2:
             continue
             
-        node_title = node.get("title") or node.get("type", node_title_fallback)
         node_type = node.get("type", "")
+        if not _node_may_reference_models(node, node_type):
+            continue
+        is_note_like = "Note" in node_type or "PrimitiveString" in node_type
+        node_title = node.get("title") or node.get("type", node_title_fallback)
         node_cnr = ""
         if isinstance(node.get("properties"), dict):
             node_cnr = node["properties"].get("cnr_id", "") or ""
@@ -761,9 +1488,9 @@ def _collect_models_from_nodes(
                 val = raw_val.strip()
                 if not val:
                     continue
-                if val.startswith("http://") or val.startswith("https://"):
-                    parsed_filename = val.split("?")[0].split("/")[-1]
-                    if any(parsed_filename.lower().endswith(ext) for ext in MODEL_EXTENSIONS):
+                if val.startswith(_URL_PREFIXES):
+                    parsed_filename = _url_basename(val)
+                    if parsed_filename.lower().endswith(MODEL_EXTENSIONS_TUPLE):
                         widget_model_keys.add(normalize_filename_key(parsed_filename))
                     continue
                 if _looks_like_model_widget_value(val, node_type):
@@ -783,7 +1510,7 @@ def _collect_models_from_nodes(
                 filename = proxy_model.get("filename")
                 if not filename:
                     continue
-                found_models.append({
+                _add_model({
                     "filename": filename,
                     "requested_path": proxy_model.get("requested_path"),
                     "url": proxy_model.get("url"),
@@ -822,7 +1549,7 @@ def _collect_models_from_nodes(
                     else:
                         suggested_folder = None
                     
-                    found_models.append({
+                    _add_model({
                         "filename": filename,
                         "url": url,
                         "node_id": node_id,
@@ -833,25 +1560,31 @@ def _collect_models_from_nodes(
         
         # Extract links from Notes - but DON'T add them to found_models
         # They should only be used to enrich loader nodes
-        if "Note" in node_type or "PrimitiveString" in node_type:
+        if is_note_like:
             if "widgets_values" in node:
                 for val in node["widgets_values"]:
                     if isinstance(val, str):
                         # Regex to find markdown links: [text](url)
-                        links = re.findall(r'\[([^\]]+)\]\((https?://[^)]+)\)', val, re.IGNORECASE)
+                        links = _NOTE_LINK_RE.findall(val)
                         for label, url in links:
                             if not is_specific_model_file_url(url):
                                 continue
-                            url_filename = url.split("?")[0].split("/")[-1]
+                            url_filename = _url_basename(url)
                             candidates = []
-                            if any(url_filename.lower().endswith(ext) for ext in MODEL_EXTENSIONS):
+                            if url_filename.lower().endswith(MODEL_EXTENSIONS_TUPLE):
                                 candidates.append(url_filename)
-                            if any(label.lower().endswith(ext) for ext in MODEL_EXTENSIONS):
+                            if label.lower().endswith(MODEL_EXTENSIONS_TUPLE):
                                 candidates.append(label)
                             for filename in candidates:
                                 note_key = normalize_filename_key(filename)
-                                note_links.setdefault(note_key, url)
-                                note_links_normalized.setdefault(normalize_filename_compact(filename), url)
+                                # The compact key derives from note_key, so it was
+                                # recorded when note_key was first seen.
+                                if note_key in note_links:
+                                    continue
+                                note_links[note_key] = url
+                                compact_key = normalize_filename_compact(filename)
+                                if compact_key not in note_links_normalized:
+                                    note_links_normalized[compact_key] = url
             continue  # Don't process Notes as loader nodes
 
         # 2. Check properties -> models (Standard ComfyUI template format)
@@ -868,9 +1601,9 @@ def _collect_models_from_nodes(
                         # match any active widget value (stale template metadata).
                         if widget_model_keys and filename_key not in widget_model_keys:
                             continue
-                        if any(m["filename"] == filename and m["node_id"] == node_id for m in found_models):
+                        if (node_id, filename) in seen_pairs:
                             continue
-                        found_models.append({
+                        _add_model({
                             "filename": filename,
                             "requested_path": requested_path,
                             "url": model_info.get("url"),
@@ -880,12 +1613,8 @@ def _collect_models_from_nodes(
                         })
                 
         # 3. Check widgets_values for filenames
-        # SKIP for Notes/PrimitiveStrings as we handled them specifically above
-        if (
-            "widgets_values" in node
-            and not ("Note" in node_type or "PrimitiveString" in node_type)
-            and node_cnr != "comfyui_controlnet_aux"
-        ):
+        # (Notes/PrimitiveStrings never reach here; their branch above continues)
+        if "widgets_values" in node and node_cnr != "comfyui_controlnet_aux":
             widgets = node["widgets_values"]
             if isinstance(widgets, list):
                 for idx, val in enumerate(widgets):
@@ -895,18 +1624,18 @@ def _collect_models_from_nodes(
                         continue
 
                     # CASE A: Value is a URL
-                    if val.startswith("http://") or val.startswith("https://"):
+                    if val.startswith(_URL_PREFIXES):
                         # Check if it points to a model file
-                        if any(val.endswith(ext) for ext in MODEL_EXTENSIONS) or "blob" in val or "resolve" in val:
+                        if val.endswith(MODEL_EXTENSIONS_TUPLE) or "blob" in val or "resolve" in val:
                             # Try to extract filename from URL
                             # Typical specific link: https://.../resolve/main/filename.safetensors
                             # Or query params? 
-                            parsed_filename = val.split("?")[0].split("/")[-1]
+                            parsed_filename = _url_basename(val)
                             # If it looks like a model filename
-                            if any(parsed_filename.endswith(ext) for ext in MODEL_EXTENSIONS):
-                                if not any(m["filename"] == parsed_filename and m["node_id"] == node_id for m in found_models):
+                            if parsed_filename.endswith(MODEL_EXTENSIONS_TUPLE):
+                                if (node_id, parsed_filename) not in seen_pairs:
                                     suggested_folder = resolve_node_folder(node)
-                                    found_models.append({
+                                    _add_model({
                                         "filename": parsed_filename,
                                         "url": val,
                                         "node_id": node_id,
@@ -921,10 +1650,10 @@ def _collect_models_from_nodes(
                         # Note: we don't check against subgraph findings here yet, 
                         # duplicate filtering happens in process_workflow
                         filename, requested_path = split_model_identifier(val)
-                        if not any(m["filename"] == filename and m["node_id"] == node_id for m in found_models):
+                        if (node_id, filename) not in seen_pairs:
                             # Try to map folder
                             suggested_folder = resolve_node_folder(node)
-                            found_models.append({
+                            _add_model({
                                 "filename": filename,
                                 "requested_path": requested_path,
                                 "url": None,
@@ -951,7 +1680,7 @@ def _collect_models_from_nodes(
                             u_widgets = upstream_node["widgets_values"]
                             if isinstance(u_widgets, list):
                                 for u_val in u_widgets:
-                                    if isinstance(u_val, str) and (u_val.startswith("http://") or u_val.startswith("https://")):
+                                    if isinstance(u_val, str) and u_val.startswith(_URL_PREFIXES):
                                         # It's a URL in the upstream node
                                         # Check if we should attribute it to this node?
                                         # Or just ensure it's captured (which it likely is by the main loop)
@@ -964,15 +1693,15 @@ def _collect_models_from_nodes(
                                         # Simplification: If this node requires a model (found above), and has no URL, and upstream has a URL, use it.
                                         
                                         # Let's iterate over found_models for this node and enrich them
-                                        for m in found_models:
-                                            if m["node_id"] == node_id and not m["url"]:
+                                        for m in models_by_node.get(node_id, ()):
+                                            if not m["url"]:
                                                 # Check if the URL filename matches? 
                                                 # Or just blindly assign if it's the only one?
                                                 # "count this as a link for this loader's model" implies loose coupling or direct assignment.
                                                 
                                                 # Let's verify if URL looks like a model
-                                                if any(u_val.endswith(ext) for ext in MODEL_EXTENSIONS) or "blob" in u_val or "resolve" in u_val:
-                                                    url_filename = u_val.split("?")[0].split("/")[-1]
+                                                if u_val.endswith(MODEL_EXTENSIONS_TUPLE) or "blob" in u_val or "resolve" in u_val:
+                                                    url_filename = _url_basename(u_val)
                                                     if url_filename and url_filename.lower() == m["filename"].lower():
                                                         m["url"] = u_val
                                                         m["note"] = f"Resolved from upstream node {upstream_node.get('title', upstream_id)}"
@@ -1027,6 +1756,10 @@ def extract_models_from_workflow(workflow: Dict[str, Any]) -> List[Dict[str, Any
         "Unknown Node"
     )
 
+    # Most workflows carry no Note links; skip normalizing every filename then.
+    if not note_links and not note_links_normalized:
+        return found_models
+
     # Enrich found_models with URLs from note_links.
     # Note links should never override an already valid file URL from loader metadata.
     for model in found_models:
@@ -1036,11 +1769,13 @@ def extract_models_from_workflow(workflow: Dict[str, Any]) -> List[Dict[str, Any
             url = note_links_normalized.get(normalize_filename_compact(model["filename"]))
         if not url:
             continue
-        if not is_specific_model_file_url(url, expected_filename=model["filename"]):
-            continue
+        # Both checks must pass; test the loader's own URL first since a valid one
+        # makes the Note URL irrelevant.
         existing_url = model.get("url")
         if existing_url and is_specific_model_file_url(existing_url):
             continue
+        if not is_specific_model_file_url(url, expected_filename=model["filename"]):
+            continue
         model["url"] = url
         model["source"] = "note"
         model["note"] = "URL from Note"
@@ -1049,35 +1784,76 @@ def extract_models_from_workflow(workflow: Dict[str, Any]) -> List[Dict[str, Any
 
 def is_subgraph_node(node_type: str) -> bool:
     """Check if node_type is a UUID (indicates subgraph wrapper node)"""
-    import re
-    uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-    return bool(re.match(uuid_pattern, node_type, re.IGNORECASE))
-
-def recursive_find_file(filename: str, root_dir: str) -> str | None:
-    """Recursively searches for a file within a directory."""
-    for dirpath, _, filenames in os.walk(root_dir):
-        if filename in filenames:
-            return os.path.join(dirpath, filename)
-    return None
+    # Length/dash check rejects ordinary node type names without the regex.
+    if len(node_type) != 36 or node_type.count("-") != 4:
+        return False
+    return _SUBGRAPH_UUID_RE.match(node_type) is not None
 
-def recursive_find_file_by_stem(stem: str, root_dir: str) -> str | None:
-    """Recursively searches for a file by exact stem or stem + known extension."""
-    stem_lower = (stem or "").lower()
-    if not stem_lower:
-        return None
-    for dirpath, _, filenames in os.walk(root_dir):
-        for file in filenames:
-            file_lower = file.lower()
-            if file_lower == stem_lower or file_lower.startswith(stem_lower + "."):
-                return os.path.join(dirpath, file)
-    return None
+@functools.lru_cache(maxsize=64)
+def _cached_folder_paths(folder_type: str) -> tuple[str, ...]:
+    """folder_paths.get_folder_paths as a hashable tuple; () for unknown types."""
+    try:
+        return tuple(folder_paths.get_folder_paths(folder_type))
+    except KeyError:
+        return ()
 
-def recursive_find_dir(dirname: str, root_dir: str) -> str | None:
-    """Recursively searches for a directory."""
-    for dirpath, dirnames, _ in os.walk(root_dir):
-        if dirname in dirnames:
-            return os.path.join(dirpath, dirname)
-    return None
+def _build_root_file_index(root_dir: str) -> SimpleNamespace:
+    """
+    Walk a model root once and index it for the lookups check_model_files needs.
+    Each key maps to the first match in os.walk's top-down order:
+      - files_by_name: exact filename -> path
+      - files_by_stem: lowercased name or any "<prefix>." stem of it -> path
+      - dirs_by_name: exact directory name -> path
+    The walk uses os.scandir directly so each entry's type comes from the
+    directory listing; like os.walk, symlinked directories are indexed but
+    not descended into.
+    """
+    files_by_name: dict[str, str] = {}
+    files_by_stem: dict[str, str] = {}
+    dirs_by_name: dict[str, str] = {}
+    stack = [root_dir]
+    while stack:
+        top = stack.pop()
+        try:
+            scanner = os.scandir(top)
+        except OSError:
+            continue
+        subdirs = []
+        with scanner:
+            for entry in scanner:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if name not in dirs_by_name:
+                        dirs_by_name[name] = entry.path
+                    try:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    except OSError:
+                        pass
+                    continue
+                path = entry.path
+                if name not in files_by_name:
+                    files_by_name[name] = path
+                file_lower = name.lower()
+                dot = file_lower.find(".")
+                stems = [file_lower]
+                while dot != -1:
+                    stems.append(file_lower[:dot])
+                    dot = file_lower.find(".", dot + 1)
+                for stem in stems:
+                    if stem not in files_by_stem:
+                        files_by_stem[stem] = path
+        # Reversed so the stack pops subdirectories in listing order, as os.walk visits them.
+        stack.extend(reversed(subdirs))
+    return SimpleNamespace(
+        files_by_name=files_by_name,
+        files_by_stem=files_by_stem,
+        dirs_by_name=dirs_by_name,
+    )
 
 def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
@@ -1098,14 +1874,38 @@ def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str
     def _is_path_like(value: str) -> bool:
         return ("/" in value) or ("\\" in value)
 
-    for model in found_models:
+    # Folder paths can change between requests (extra_model_paths edits), so the
+    # memo only spans a single check.
+    _cached_folder_paths.cache_clear()
+
+    # Roots are walked at most once per call, and only after an exact-path miss.
+    # Lookups run on worker threads, so each root is indexed under its own lock.
+    root_indexes: dict[str, SimpleNamespace] = {}
+    root_index_locks: dict[str, threading.Lock] = {}
+
+    def _root_index(root_path: str) -> SimpleNamespace:
+        index = root_indexes.get(root_path)
+        if index is not None:
+            return index
+        with root_index_locks.setdefault(root_path, threading.Lock()):
+            index = root_indexes.get(root_path)
+            if index is None:
+                index = _build_root_file_index(root_path)
+                root_indexes[root_path] = index
+        return index
+
+    # Many models share the same few roots; stat each root once per call.
+    root_exists: dict[str, bool] = {}
+
+    def _root_exists(root_path: str) -> bool:
+        exists = root_exists.get(root_path)
+        if exists is None:
+            exists = os.path.exists(root_path)
+            root_exists[root_path] = exists
+        return exists
+
+    def _locate(model: Dict[str, Any]) -> Tuple[str, str] | None:
         filename = model["filename"]
-        requested_path = model.get("requested_path") or filename
-        
-        # Skip models with None/null filenames (from disabled nodes or empty widgets)
-        if filename is None or filename == "null" or not filename:
-            continue
-            
         folder_type = model.get("suggested_folder", "checkpoints")
         
         # Safety check: if folder_type is None, default to checkpoints
@@ -1113,10 +1913,7 @@ def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str
             folder_type = "checkpoints"
         
         # Use ComfyUI's folder_paths to get valid paths for this type
-        try:
-            search_paths = folder_paths.get_folder_paths(folder_type)
-        except KeyError:
-            search_paths = []
+        search_paths = _cached_folder_paths(folder_type)
 
         if not search_paths:
             # Fallback to standard models/ structure if type unknown
@@ -1133,7 +1930,7 @@ def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str
         allow_nunchaku_fuzzy = _is_nunchaku_extensionless_identifier(filename)
         
         for root_path in search_paths:
-             if not os.path.exists(root_path):
+             if not _root_exists(root_path):
                  continue
                  
              # 1. Exact match check (e.g., "model.safetensors" in "models/checkpoints/model.safetensors")
@@ -1144,7 +1941,8 @@ def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str
                  break
                  
              # 2. Recursive search (e.g., "model.safetensors" in "models/checkpoints/subfolder/model.safetensors")
-             found_file = recursive_find_file(filename, root_path)
+             index = _root_index(root_path)
+             found_file = index.files_by_name.get(filename)
              if found_file:
                  found_path = found_file
                  found_root = root_path
@@ -1153,18 +1951,37 @@ def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str
              # Nunchaku workflows may store extensionless SVDQ identifiers (e.g. svdq-int4-...).
              # Try matching stem-based filenames and directories for these nodes.
              if allow_nunchaku_fuzzy:
-                 found_file = recursive_find_file_by_stem(filename, root_path)
+                 found_file = index.files_by_stem.get(filename.lower())
                  if found_file:
                      found_path = found_file
                      found_root = root_path
                      break
-                 found_dir = recursive_find_dir(filename, root_path)
+                 found_dir = index.dirs_by_name.get(filename)
                  if found_dir:
                      found_path = found_dir
                      found_root = root_path
                      break
-        
+
         if found_path:
+            return found_path, found_root
+        return None
+
+    # Skip models with None/null filenames (from disabled nodes or empty widgets)
+    candidates = [m for m in found_models if m["filename"] and m["filename"] != "null"]
+    if len(candidates) > 1 and MODEL_CHECK_WORKERS > 1:
+        # Lookups are stat/walk-bound and release the GIL, which helps on
+        # network-mounted model folders.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(MODEL_CHECK_WORKERS, len(candidates))
+        ) as pool:
+            locations = list(pool.map(_locate, candidates))
+    else:
+        locations = [_locate(m) for m in candidates]
+
+    for model, location in zip(candidates, locations):
+        requested_path = model.get("requested_path") or model["filename"]
+        if location:
+            found_path, found_root = location
             # Calculate relative path to see if it matches the widget value
             try:
                 # Get path relative to the *specific* root_path where it was found
@@ -1176,9 +1993,11 @@ def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str
             req_norm = requested_path.replace("\\", "/")
             found_norm = rel_path.replace("\\", "/")
             
-            model_entry = model.copy()
-            model_entry["found_path"] = found_path
-            model_entry["clean_path"] = rel_path # Path relative to the model type root
+            model_entry = {
+                **model,
+                "found_path": found_path,
+                "clean_path": rel_path,  # Path relative to the model type root
+            }
             
             existing.append(model_entry)
             
@@ -1195,39 +2014,146 @@ def check_model_files(found_models: List[Dict[str, Any]]) -> Tuple[List[Dict[str
 def _normalize_hf_search_key(filename: str) -> str:
     return os.path.basename(filename or "").lower()
 
+def _hf_rate_limit_active() -> bool:
+    return bool(_hf_rate_limited_until) and time.monotonic() < _hf_rate_limited_until
+
 def _hf_search_allowed() -> bool:
-    global _hf_api_calls
-    if _hf_rate_limited_until and time.time() < _hf_rate_limited_until:
+    # Deadlines are monotonic so wall-clock adjustments can't end or extend a pause.
+    now = time.monotonic()
+    if _hf_rate_limited_until and now < _hf_rate_limited_until:
         return False
-    if _hf_search_deadline and time.time() >= _hf_search_deadline:
+    if _hf_search_deadline and now >= _hf_search_deadline:
         global _hf_search_time_exhausted
         _hf_search_time_exhausted = True
         return False
-    if _hf_api_calls >= HF_SEARCH_MAX_CALLS:
-        return False
-    _hf_api_calls += 1
-    return True
+    return _hf_call_bucket.acquire()
+
+def _retry_after_seconds(err: Exception | None) -> int | None:
+    """Read a Retry-After header (seconds) from an HTTP error response, if any."""
+    response = getattr(err, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(1, int(float(value)))
+    except (TypeError, ValueError):
+        return None
 
-def _set_hf_rate_limited() -> None:
-    global _hf_rate_limited_until
+def _set_hf_rate_limited(err: Exception | None = None) -> None:
+    global _hf_rate_limited_until, _hf_rate_limited_at
     if _hf_rate_limited_until:
         return
-    _hf_rate_limited_until = time.time() + HF_SEARCH_RATE_LIMIT_SECONDS
-    print(f"[WARN] Hugging Face rate limit hit; pausing search for {HF_SEARCH_RATE_LIMIT_SECONDS}s.")
+    _hf_rate_limited_at = time.monotonic()
+    _hf_call_bucket.drain()
+    # Honor the server's Retry-After hint when present instead of the fixed pause.
+    pause = _retry_after_seconds(err) or HF_SEARCH_RATE_LIMIT_SECONDS
+    pause = min(pause, HF_SEARCH_RATE_LIMIT_SECONDS)
+    _hf_rate_limited_until = time.monotonic() + pause
+    print(f"[WARN] Hugging Face rate limit hit; pausing search for {pause}s.")
 
 def _hf_search_budget_exhausted() -> bool:
-    if _hf_rate_limited_until and time.time() < _hf_rate_limited_until:
+    if _hf_rate_limit_active():
         return True
-    if _hf_api_calls >= HF_SEARCH_MAX_CALLS:
-        return True
-    return False
+    return _hf_call_bucket.available() < 1
+
+def _refill_hf_call_bucket() -> None:
+    """
+    Restore the full burst allowance, unless HF rate limited us within the last
+    HF_SEARCH_RATE_LIMIT_SECONDS; then the drained bucket keeps refilling at the
+    sustained rate so the next stage or run doesn't open with a burst.
+    """
+    if _hf_rate_limited_at and time.monotonic() - _hf_rate_limited_at < HF_SEARCH_RATE_LIMIT_SECONDS:
+        return
+    _hf_call_bucket.reset()
 
 def _reset_hf_search_budget() -> None:
-    global _hf_api_calls, _hf_search_deadline, _hf_search_time_exhausted
-    _hf_api_calls = 0
-    _hf_search_deadline = time.time() + HF_SEARCH_MAX_SECONDS if HF_SEARCH_MAX_SECONDS > 0 else 0.0
+    global _hf_search_deadline, _hf_search_time_exhausted
+    _refill_hf_call_bucket()
+    _hf_search_deadline = time.monotonic() + HF_SEARCH_MAX_SECONDS if HF_SEARCH_MAX_SECONDS > 0 else 0.0
     _hf_search_time_exhausted = False
 
+def _charge_url_probes(urls: list[str]) -> set[str]:
+    """
+    The urls that may be HEAD-probed: ones already in _hf_url_exists_cache are
+    free, every other one spends a search-budget token, and none are charged
+    after the first refusal (budget spent or rate limited).
+    """
+    allowed: set[str] = set()
+    budget_left = True
+    for url in dict.fromkeys(urls):
+        if url not in _hf_url_exists_cache:
+            if not budget_left or not _hf_search_allowed():
+                budget_left = False
+                continue
+        allowed.add(url)
+    return allowed
+
+def _find_at_repo_roots(repo_ids: list[str], filenames: list[str]) -> dict[str, str]:
+    """
+    Map each filename to the first repo in repo_ids holding it at the root.
+    Cached listings answer in memory; only repos without one are HEAD-probed,
+    and each probe that needs a request spends a search-budget token, so the
+    pass stops probing once the budget or rate limit says no.
+    """
+    root_hits: dict[str, set[str]] = {}
+    probes: list[tuple[str, str, str]] = []
+    for repo_id in repo_ids:
+        files = _hf_repo_files_cache.get(repo_id)
+        if files:
+            root_files = set(files)
+            root_hits[repo_id] = {name for name in filenames if name in root_files}
+            continue
+        for name in filenames:
+            probes.append((repo_id, name, f"https://huggingface.co/{repo_id}/resolve/main/{name}"))
+    allowed = _charge_url_probes([url for _repo_id, _name, url in probes])
+    probes = [probe for probe in probes if probe[2] in allowed]
+    if probes:
+        live = _hf_urls_exist([url for _repo_id, _name, url in probes])
+        for repo_id, name, url in probes:
+            if live.get(url):
+                root_hits.setdefault(repo_id, set()).add(name)
+
+    found: dict[str, str] = {}
+    for repo_id in repo_ids:
+        for name in root_hits.get(repo_id, ()):
+            found.setdefault(name, repo_id)
+    return found
+
+def _probe_resolved_repos(filename: str, resolved_repos: list[tuple[str, list[str]]]) -> Dict[str, Any] | None:
+    """
+    Look for filename in repos that already resolved other workflow files: use
+    a cached listing when there is one (no request needed), otherwise HEAD the
+    file in each folder a previous hit came from. Uncached HEADs are charged
+    to the search budget. Returns a search result dict or None.
+    """
+    filename_lower = filename.lower()
+    candidates: list[tuple[str, str]] = []
+    for repo_id, folders in resolved_repos:
+        files = _hf_repo_files_cache.get(repo_id)
+        if files:
+            match_path = _repo_basename_index(repo_id, files).get(filename_lower)
+            if match_path:
+                return {
+                    "url": f"https://huggingface.co/{repo_id}/resolve/main/{match_path}",
+                    "hf_repo": repo_id,
+                    "hf_path": match_path
+                }
+            continue
+        for folder in folders:
+            candidates.append((repo_id, f"{folder}/{filename}" if folder else filename))
+    if not candidates:
+        return None
+    urls = [f"https://huggingface.co/{repo_id}/resolve/main/{path}" for repo_id, path in candidates]
+    allowed = _charge_url_probes(urls)
+    if not allowed:
+        return None
+    live = _hf_urls_exist([url for url in urls if url in allowed])
+    for (repo_id, path), url in zip(candidates, urls):
+        if live.get(url):
+            return {"url": url, "hf_repo": repo_id, "hf_path": path}
+    return None
+
 def search_huggingface_model(
     filename: str,
     token: str = None,
@@ -1235,17 +2161,23 @@ def search_huggingface_model(
     mode: str = "full",
     workflow_keywords: list[str] | None = None,
     priority_author_repos: dict[str, list[str]] | None = None,
-    skip_priority_repo_scan: bool = False
+    skip_priority_repo_scan: bool = False,
+    resolved_repos: list[tuple[str, list[str]]] | None = None,
+    on_miss=None
 ) -> Dict[str, Any] | None:
     """
     Searches Hugging Face for the filename, prioritizing specific authors.
+    resolved_repos is a list of (repo_id, folders) that already served other
+    files of the same workflow; those are probed before any search call.
+    on_miss() is called when the search ran to the end without a match, as
+    opposed to stopping on budget, rate limit, timeout or error.
     Returns metadata dict with url/hf_repo/hf_path or None.
     """
-    api = HfApi(token=token)
+    api = _get_hf_api(token)
 
     key = _normalize_hf_search_key(filename)
-    if key in _hf_search_cache:
-        cached = _hf_search_cache[key]
+    cached = _hf_search_cache.get(key, _CACHE_MISS)
+    if cached is not _CACHE_MISS:
         if cached is not None:
             print(f"[DEBUG] HF cache hit for {filename}")
             return cached
@@ -1258,13 +2190,27 @@ def search_huggingface_model(
         _hf_search_cache[key] = None
         return None
 
-    if _hf_rate_limited_until and time.time() < _hf_rate_limited_until:
+    if _hf_rate_limit_active():
         print(f"[DEBUG] HF search paused due to rate limit; skipping {filename}")
         return None
-    if _hf_api_calls >= HF_SEARCH_MAX_CALLS:
+    if _hf_call_bucket.available() < 1:
         print(f"[DEBUG] HF search budget exhausted; skipping {filename}")
         return None
 
+    if resolved_repos:
+        result = _probe_resolved_repos(filename, resolved_repos)
+        if result:
+            _hf_search_cache[key] = result
+            print(f"[DEBUG] Found {filename} in repo {result['hf_repo']} (resolved this run)")
+            if status_cb:
+                status_cb({
+                    "message": "Found on Hugging Face",
+                    "source": "huggingface_search",
+                    "filename": filename,
+                    "detail": result["hf_repo"]
+                })
+            return result
+
     if status_cb:
         status_cb({
             "message": "Searching Hugging Face",
@@ -1274,54 +2220,58 @@ def search_huggingface_model(
 
     print(f"[DEBUG] Searching HF for: {filename}")
 
-    def add_term(terms: list[str], term: str | None):
+    # Terms are kept in a dict used as an insertion-ordered set.
+    def add_term(terms: dict[str, None], term: str | None):
         if not term:
             return
         term = term.strip()
-        if len(term) < 4 or term in terms:
-            return
-        terms.append(term)
+        if len(term) >= 4:
+            terms.setdefault(term, None)
 
-    def build_search_terms(name: str) -> list[str]:
+    def collect_search_terms(name: str) -> dict[str, None]:
         stem = os.path.splitext(name)[0]
-        terms: list[str] = []
+        terms: dict[str, None] = {}
         add_term(terms, name)
         add_term(terms, stem)
         add_term(terms, stem.replace("_", "-"))
         add_term(terms, stem.replace("-", "_"))
-        tokens = [t for t in re.split(r"[-_]", stem) if t]
+        tokens = [t for t in _NAME_TOKEN_SPLIT_RE.split(stem) if t]
         if len(tokens) >= 2:
             add_term(terms, "-".join(tokens[:2]))
         if len(tokens) >= 3:
             add_term(terms, "-".join(tokens[:3]))
         return terms
 
+    def build_search_terms(name: str) -> list[str]:
+        return list(collect_search_terms(name))
+
     def build_author_search_terms(name: str) -> list[str]:
-        terms = build_search_terms(name)
+        terms = collect_search_terms(name)
         stem = os.path.splitext(name)[0]
-        tokens = [t for t in re.split(r"[-_]", stem) if t]
+        tokens = [t for t in _NAME_TOKEN_SPLIT_RE.split(stem) if t]
         for t in tokens:
-            alpha = re.sub(r"\d+", "", t).lower()
+            alpha = _DIGITS_RE.sub("", t).lower()
             add_term(terms, alpha)
-        return terms
+        return list(terms)
 
-    stem_lower = os.path.splitext(filename)[0].lower()
-    token_hints = []
-    for t in re.split(r"[-_]", stem_lower):
-        t = t.strip().lower()
+    filename_lower = filename.lower()
+    stem_lower = os.path.splitext(filename_lower)[0]
+    # Hints are deduped as they are collected, in first-seen order.
+    token_hint_set: dict[str, None] = {}
+    for t in _NAME_TOKEN_SPLIT_RE.split(stem_lower):
+        t = t.strip()
         if len(t) >= 3:
-            token_hints.append(t)
-        alpha = re.sub(r"\d+", "", t)
+            token_hint_set[t] = None
+        alpha = _DIGITS_RE.sub("", t) if not t.isalpha() else t
         if len(alpha) >= 3:
-            token_hints.append(alpha)
-    token_hints = list(dict.fromkeys(token_hints))
-    workflow_hints = []
-    if workflow_keywords:
-        for t in workflow_keywords:
-            t = str(t or "").strip().lower()
-            if len(t) >= 3:
-                workflow_hints.append(t)
-    workflow_hints = list(dict.fromkeys(workflow_hints))
+            token_hint_set[alpha] = None
+    token_hints = list(token_hint_set)
+    workflow_hint_set: dict[str, None] = {}
+    for t in workflow_keywords or ():
+        t = str(t or "").strip().lower()
+        if len(t) >= 3:
+            workflow_hint_set[t] = None
+    workflow_hints = list(workflow_hint_set)
 
     def _repo_score(model_id: str) -> int:
         mid = model_id.lower()
@@ -1342,13 +2292,28 @@ def search_huggingface_model(
         mid = model_id.lower()
         return any(t in mid for t in workflow_hints)
 
+    # The same repos are ranked by several sorts below; score each id once.
+    repo_ranks: dict[str, tuple[int, int]] = {}
+
+    def _repo_rank(model_id: str) -> tuple[int, int]:
+        """(0 if workflow match else 1, -score): ascending sort puts best first."""
+        rank = repo_ranks.get(model_id)
+        if rank is None:
+            rank = (0 if _workflow_match(model_id) else 1, -_repo_score(model_id))
+            repo_ranks[model_id] = rank
+        return rank
+
     # 1. Try to search specifically in priority authors' repos first?
     # Actually, listing models by author and filtering is expensive.
     # Better to use the global search and filter results.
 
+    search_failed = False
     try:
         search_terms = build_search_terms(filename)
         models = []
+        # Terms whose global search came back empty; an author-scoped search for
+        # the same term is a subset and would be empty too.
+        empty_global_terms: set[str] = set()
         if status_cb:
             status_cb({
                 "message": "Searching Hugging Face",
@@ -1358,11 +2323,12 @@ def search_huggingface_model(
 
         if mode in ("basic", "full"):
             for term in search_terms:
-                if not _hf_search_allowed():
+                term_query = {"search": term, "limit": 20, "sort": "downloads", "direction": -1}
+                if not _list_models_cached(api, **term_query) and not _hf_search_allowed():
                     print(f"[DEBUG] HF search budget/rate limit hit before term search for {filename}")
                     return None
                 try:
-                    models = list(call_with_timeout(api.list_models, search=term, limit=20, sort="downloads", direction=-1))
+                    models = _list_models(api, **term_query)
                 except concurrent.futures.TimeoutError:
                     if status_cb:
                         status_cb({
@@ -1383,7 +2349,7 @@ def search_huggingface_model(
                             })
                         return None
                     if is_rate_limited_error(e):
-                        _set_hf_rate_limited()
+                        _set_hf_rate_limited(e)
                         if status_cb:
                             status_cb({
                                 "message": "Hugging Face rate limit hit",
@@ -1397,6 +2363,7 @@ def search_huggingface_model(
                     if term != filename:
                         print(f"[DEBUG] No results for {filename}, trying search term: {term}")
                     break
+                empty_global_terms.add(term)
 
         # Deep Search Fallback: Check priority authors if still nothing
         # This helps when the file is inside a repo like "flux-fp8" but we search for "flux-vae-bf16"
@@ -1421,18 +2388,20 @@ def search_huggingface_model(
                             "detail": author
                         })
                     for term in author_search_terms:
-                        if not _hf_search_allowed():
+                        if term in empty_global_terms:
+                            continue
+                        author_query = {
+                            "author": author,
+                            "search": term,
+                            "limit": 15,
+                            "sort": "downloads",
+                            "direction": -1
+                        }
+                        if not _list_models_cached(api, **author_query) and not _hf_search_allowed():
                             print(f"[DEBUG] HF search budget/rate limit hit before author term search for {filename}")
                             return None
                         try:
-                            author_models = list(call_with_timeout(
-                                api.list_models,
-                                author=author,
-                                search=term,
-                                limit=15,
-                                sort="downloads",
-                                direction=-1
-                            ))
+                            author_models = _list_models(api, **author_query)
                         except concurrent.futures.TimeoutError:
                             if status_cb:
                                 status_cb({
@@ -1453,7 +2422,7 @@ def search_huggingface_model(
                                     })
                                 return None
                             if is_rate_limited_error(e):
-                                _set_hf_rate_limited()
+                                _set_hf_rate_limited(e)
                                 if status_cb:
                                     status_cb({
                                         "message": "Hugging Face rate limit hit",
@@ -1472,11 +2441,14 @@ def search_huggingface_model(
                             print(f"[DEBUG] Priority author {author} repos for {filename}: {ids}")
                         except Exception:
                             pass
-                    if not _hf_search_allowed():
+                    if (
+                        not _list_models_cached(api, author=author, **_AUTHOR_MODELS_QUERY)
+                        and not _hf_search_allowed()
+                    ):
                         print(f"[DEBUG] HF search budget/rate limit hit before author list for {filename}")
                         return None
                     try:
-                        author_list = list(call_with_timeout(api.list_models, author=author, limit=100, sort="downloads", direction=-1))
+                        author_list = _list_author_models(api, author)
                     except concurrent.futures.TimeoutError:
                         if status_cb:
                             status_cb({
@@ -1497,7 +2469,7 @@ def search_huggingface_model(
                                 })
                             return None
                         if is_rate_limited_error(e):
-                            _set_hf_rate_limited()
+                            _set_hf_rate_limited(e)
                             if status_cb:
                                 status_cb({
                                     "message": "Hugging Face rate limit hit",
@@ -1510,8 +2482,7 @@ def search_huggingface_model(
                     if author_list:
                         author_list = sorted(
                             author_list,
-                            key=lambda m: _repo_score(getattr(m, "modelId", "")),
-                            reverse=True
+                            key=lambda m: _repo_rank(getattr(m, "modelId", ""))[1]
                         )
                         found.extend(author_list)
                     print(f"[DEBUG] Priority author {author} list returned {len(author_list)} repos for {filename}")
@@ -1549,16 +2520,27 @@ def search_huggingface_model(
                 priority_repo_ids.extend(priority_author_repos.get(author, []))
         priority_repo_ids = list(dict.fromkeys(priority_repo_ids))
         if priority_repo_ids:
-            priority_repo_ids = sorted(
-                priority_repo_ids,
-                key=lambda rid: (
-                    0 if _workflow_match(rid) else 1,
-                    -_repo_score(rid)
-                )
-            )
+            priority_repo_ids = sorted(priority_repo_ids, key=_repo_rank)
             if PRIORITY_REPO_SCAN_LIMIT > 0:
                 priority_repo_ids = priority_repo_ids[:PRIORITY_REPO_SCAN_LIMIT]
 
+            # Cheap pre-pass over the curated repos: check the file at each repo root
+            # (cached listing, else a budgeted HEAD) and take the best-ranked hit
+            # before listing anything.
+            rid = _find_at_repo_roots(priority_repo_ids, [filename]).get(filename)
+            if rid:
+                result = build_result(rid, filename)
+                _hf_search_cache[key] = result
+                print(f"[DEBUG] Found {filename} at root of repo {rid} (priority author)")
+                if status_cb:
+                    status_cb({
+                        "message": "Found on Hugging Face",
+                        "source": "huggingface_search",
+                        "filename": filename,
+                        "detail": rid
+                    })
+                return result
+
         priority_models: list[Any] = []
         if priority_repo_ids:
             priority_models = [SimpleNamespace(modelId=rid) for rid in priority_repo_ids]
@@ -1569,185 +2551,133 @@ def search_huggingface_model(
             ]
         priority_models = sorted(
             priority_models,
-            key=lambda m: (
-                0 if _workflow_match(getattr(m, "modelId", "")) else 1,
-                -_repo_score(getattr(m, "modelId", ""))
-            )
+            key=lambda m: _repo_rank(getattr(m, "modelId", ""))
         )
 
-        for model in priority_models:
-            model_id = model.modelId
-            # Check if this repo actually has the file
-            try:
-                files = _get_repo_files(api, model_id, token)
-                filename_lower = filename.lower()
-                if any(os.path.basename(f).lower() == filename_lower for f in files):
-                    match_path = next(
-                        (f for f in files if os.path.basename(f).lower() == filename_lower),
-                        filename
+        def scan_repos(candidates: list[tuple[str, str]]):
+            """
+            Look for filename in each (repo_id, tier_note) candidate, in order.
+            Listings are fetched in concurrent waves of HF_REPO_SCAN_BATCH_SIZE;
+            the first repo (in order) that has the file wins. Returns the result,
+            None, or _SCAN_STOP when the search budget ran out.
+            """
+            model_ids = [mid for mid, _suffix in candidates]
+            # Repos named after the file usually hold it at the root; a HEAD on its
+            # resolve URL answers that without pulling the whole file listing.
+            named_repos = {
+                mid for mid in model_ids
+                if stem_lower and stem_lower in mid.lower() and mid not in _hf_repo_files_cache
+            }
+            for repo_index, (model_id, suffix) in enumerate(candidates):
+                if repo_index % HF_REPO_SCAN_BATCH_SIZE == 0:
+                    _get_repo_files_batch(
+                        api,
+                        [
+                            mid for mid in model_ids[repo_index:repo_index + HF_REPO_SCAN_BATCH_SIZE]
+                            if mid not in named_repos
+                        ],
+                        token
                     )
-                    result = build_result(model_id, match_path)
-                    _hf_search_cache[key] = result
-                    print(f"[DEBUG] Found {filename} in repo {model_id} (priority author)")
-                    if status_cb:
-                        status_cb({
-                            "message": "Found on Hugging Face",
-                            "source": "huggingface_search",
-                            "filename": filename,
-                            "detail": model_id
-                        })
-                    return result
-                print(f"[DEBUG] {filename} not in repo {model_id} (priority author)")
-            except HFSearchBudgetError:
-                print(f"[DEBUG] HF search budget/rate limit hit before priority repo scan for {filename}")
-                return None
-            except concurrent.futures.TimeoutError:
-                print(f"[DEBUG] list_repo_files timeout for {model_id} while searching {filename} (priority author)")
-                if status_cb:
-                    status_cb({
-                        "message": "Hugging Face search timeout",
-                        "source": "huggingface_search",
-                        "filename": filename,
-                        "detail": f"list_repo_files({model_id})"
-                    })
-                continue
-            except Exception as e:
-                if is_timeout_error(e):
-                    print(f"[DEBUG] list_repo_files timeout for {model_id} while searching {filename} (priority author)")
-                    if status_cb:
-                        status_cb({
-                            "message": "Hugging Face search timeout",
-                            "source": "huggingface_search",
-                            "filename": filename,
-                            "detail": f"list_repo_files({model_id})"
-                        })
+                if model_id in named_repos:
+                    root_result = build_result(model_id, filename)
+                    # Without budget, skip the HEAD; the listing below stops the scan.
+                    if _charge_url_probes([root_result["url"]]) and _hf_url_exists(root_result["url"]):
+                        _hf_search_cache[key] = root_result
+                        print(f"[DEBUG] Found {filename} at root of repo {model_id}{suffix}")
+                        if status_cb:
+                            status_cb({
+                                "message": "Found on Hugging Face",
+                                "source": "huggingface_search",
+                                "filename": filename,
+                                "detail": model_id
+                            })
+                        return root_result
+                # Check if this repo actually has the file
+                try:
+                    files = _get_repo_files(api, model_id, token)
+                    match_path = _repo_basename_index(model_id, files).get(filename_lower)
+                    if match_path is not None:
+                        result = build_result(model_id, match_path)
+                        _hf_search_cache[key] = result
+                        print(f"[DEBUG] Found {filename} in repo {model_id}{suffix}")
+                        if status_cb:
+                            status_cb({
+                                "message": "Found on Hugging Face",
+                                "source": "huggingface_search",
+                                "filename": filename,
+                                "detail": model_id
+                            })
+                        return result
+                    if HF_SEARCH_VERBOSE:
+                        print(f"[DEBUG] {filename} not in repo {model_id}{suffix}")
+                except HFSearchBudgetError:
+                    print(f"[DEBUG] HF search budget/rate limit hit before repo scan for {filename}{suffix}")
+                    return _SCAN_STOP
+                except Exception as e:
+                    if is_rate_limited_error(e):
+                        _set_hf_rate_limited(e)
+                        if status_cb:
+                            status_cb({
+                                "message": "Hugging Face rate limit hit",
+                                "source": "huggingface_search",
+                                "filename": filename,
+                                "detail": str(e)
+                            })
+                        return _SCAN_STOP
+                    if isinstance(e, concurrent.futures.TimeoutError) or is_timeout_error(e):
+                        print(f"[DEBUG] list_repo_files timeout for {model_id} while searching {filename}{suffix}")
+                        if status_cb:
+                            status_cb({
+                                "message": "Hugging Face search timeout",
+                                "source": "huggingface_search",
+                                "filename": filename,
+                                "detail": f"list_repo_files({model_id})"
+                            })
                     continue
-                continue
+            return None
 
-        # If no priority author found, check the rest of the results
+        # Priority-author repos first, then the rest of the results:
+        # workflow-matched repos before everything else.
         priority_ids = {m.modelId for m in priority_models}
         other_models = [m for m in models if m.modelId not in priority_ids]
-        other_workflow = [m for m in other_models if _workflow_match(getattr(m, "modelId", ""))]
+        other_workflow = [m for m in other_models if _repo_rank(getattr(m, "modelId", ""))[0] == 0]
         other_workflow = sorted(
             other_workflow,
-            key=lambda m: -_repo_score(getattr(m, "modelId", ""))
+            key=lambda m: _repo_rank(getattr(m, "modelId", ""))[1]
         )
-        other_rest = [m for m in other_models if m not in other_workflow]
+        workflow_ids = {m.modelId for m in other_workflow}
+        other_rest = [m for m in other_models if m.modelId not in workflow_ids]
         other_rest = sorted(
             other_rest,
-            key=lambda m: -_repo_score(getattr(m, "modelId", ""))
+            key=lambda m: _repo_rank(getattr(m, "modelId", ""))[1]
         )
 
-        for model in other_workflow:
-            model_id = model.modelId
-            try:
-                files = _get_repo_files(api, model_id, token)
-                filename_lower = filename.lower()
-                if any(os.path.basename(f).lower() == filename_lower for f in files):
-                    match_path = next(
-                        (f for f in files if os.path.basename(f).lower() == filename_lower),
-                        filename
-                    )
-                    result = build_result(model_id, match_path)
-                    _hf_search_cache[key] = result
-                    print(f"[DEBUG] Found {filename} in repo {model_id}")
-                    if status_cb:
-                        status_cb({
-                            "message": "Found on Hugging Face",
-                            "source": "huggingface_search",
-                            "filename": filename,
-                            "detail": model_id
-                        })
-                    return result
-                print(f"[DEBUG] {filename} not in repo {model_id}")
-            except HFSearchBudgetError:
-                print(f"[DEBUG] HF search budget/rate limit hit before workflow repo scan for {filename}")
-                return None
-            except concurrent.futures.TimeoutError:
-                if status_cb:
-                    status_cb({
-                        "message": "Hugging Face search timeout",
-                        "source": "huggingface_search",
-                        "filename": filename,
-                        "detail": f"list_repo_files({model_id})"
-                    })
-                continue
-            except Exception as e:
-                if is_timeout_error(e):
-                    if status_cb:
-                        status_cb({
-                            "message": "Hugging Face search timeout",
-                            "source": "huggingface_search",
-                            "filename": filename,
-                            "detail": f"list_repo_files({model_id})"
-                        })
-                    continue
-                continue
-
-        for model in other_rest:
-            model_id = model.modelId
-            try:
-                files = _get_repo_files(api, model_id, token)
-                filename_lower = filename.lower()
-                if any(os.path.basename(f).lower() == filename_lower for f in files):
-                    match_path = next(
-                        (f for f in files if os.path.basename(f).lower() == filename_lower),
-                        filename
-                    )
-                    result = build_result(model_id, match_path)
-                    _hf_search_cache[key] = result
-                    print(f"[DEBUG] Found {filename} in repo {model_id}")
-                    if status_cb:
-                        status_cb({
-                            "message": "Found on Hugging Face",
-                            "source": "huggingface_search",
-                            "filename": filename,
-                            "detail": model_id
-                        })
-                    return result
-                print(f"[DEBUG] {filename} not in repo {model_id}")
-            except HFSearchBudgetError:
-                print(f"[DEBUG] HF search budget/rate limit hit before repo scan for {filename}")
-                return None
-            except concurrent.futures.TimeoutError:
-                if status_cb:
-                    status_cb({
-                        "message": "Hugging Face search timeout",
-                        "source": "huggingface_search",
-                        "filename": filename,
-                        "detail": f"list_repo_files({model_id})"
-                    })
-                continue
-            except Exception as e:
-                if is_timeout_error(e):
-                    if status_cb:
-                        status_cb({
-                            "message": "Hugging Face search timeout",
-                            "source": "huggingface_search",
-                            "filename": filename,
-                            "detail": f"list_repo_files({model_id})"
-                        })
-                    continue
-                continue
+        result = scan_repos(
+            [(m.modelId, " (priority author)") for m in priority_models]
+            + [(m.modelId, "") for m in other_workflow]
+            + [(m.modelId, "") for m in other_rest]
+        )
+        if result is _SCAN_STOP:
+            return None
+        if result:
+            return result
 
-        # Final fallback: scan priority authors more broadly if nothing matched
+        # Final fallback: scan priority authors more broadly if nothing matched.
+        # Author lists come from the shared list_models cache, and repos already
+        # scanned above are skipped.
         if mode in ("priority", "full") and not priority_author_repos:
+            scanned_ids = {m.modelId for m in models} | priority_ids
+            fallback_ids: list[str] = []
             for author in PRIORITY_AUTHORS:
-                try:
-                    if not _hf_search_allowed():
-                        return None
-                    author_models = list(call_with_timeout(api.list_models, author=author, limit=100, sort="downloads", direction=-1))
-                except concurrent.futures.TimeoutError:
-                    if status_cb:
-                        status_cb({
-                            "message": "Hugging Face search timeout",
-                            "source": "huggingface_priority_authors",
-                            "filename": filename,
-                            "detail": f"list_models({author})"
-                        })
+                if (
+                    not _list_models_cached(api, author=author, **_AUTHOR_MODELS_QUERY)
+                    and not _hf_search_allowed()
+                ):
                     return None
+                try:
+                    author_models = _list_author_models(api, author)
                 except Exception as e:
-                    if is_timeout_error(e):
+                    if isinstance(e, concurrent.futures.TimeoutError) or is_timeout_error(e):
                         if status_cb:
                             status_cb({
                                 "message": "Hugging Face search timeout",
@@ -1756,79 +2686,32 @@ def search_huggingface_model(
                                 "detail": f"list_models({author})"
                             })
                         return None
-                        if is_rate_limited_error(e):
-                            _set_hf_rate_limited()
-                            if status_cb:
-                                status_cb({
-                                    "message": "Hugging Face rate limit hit",
-                                    "source": "huggingface_priority_authors",
-                                    "filename": filename,
-                                    "detail": str(e)
-                                })
-                        return None
-                        continue
-                print(f"[DEBUG] Priority author final list for {author}: {len(author_models)} repos for {filename}")
-                for model in author_models:
-                    model_id = model.modelId
-                    try:
-                        files = _get_repo_files(api, model_id, token)
-                        filename_lower = filename.lower()
-                        if any(os.path.basename(f).lower() == filename_lower for f in files):
-                            match_path = next(
-                                (f for f in files if os.path.basename(f).lower() == filename_lower),
-                                filename
-                            )
-                            result = build_result(model_id, match_path)
-                            _hf_search_cache[key] = result
-                            print(f"[DEBUG] Found {filename} in repo {model_id} (priority author final)")
-                            if status_cb:
-                                status_cb({
-                                    "message": "Found on Hugging Face",
-                                    "source": "huggingface_search",
-                                    "filename": filename,
-                                    "detail": model_id
-                                })
-                            return result
-                        print(f"[DEBUG] {filename} not in repo {model_id} (priority author final)")
-                    except HFSearchBudgetError:
-                        print(f"[DEBUG] HF search budget/rate limit hit before priority repo scan for {filename}")
-                        return None
-                    except concurrent.futures.TimeoutError:
-                        print(f"[DEBUG] list_repo_files timeout for {model_id} while searching {filename} (priority author final)")
+                    if is_rate_limited_error(e):
+                        _set_hf_rate_limited(e)
                         if status_cb:
                             status_cb({
-                                "message": "Hugging Face search timeout",
+                                "message": "Hugging Face rate limit hit",
                                 "source": "huggingface_priority_authors",
                                 "filename": filename,
-                                "detail": f"list_repo_files({model_id})"
+                                "detail": str(e)
                             })
-                        continue
-                    except Exception as e:
-                        if is_timeout_error(e):
-                            print(f"[DEBUG] list_repo_files timeout for {model_id} while searching {filename} (priority author final)")
-                            if status_cb:
-                                status_cb({
-                                    "message": "Hugging Face search timeout",
-                                    "source": "huggingface_priority_authors",
-                                    "filename": filename,
-                                    "detail": f"list_repo_files({model_id})"
-                                })
-                            continue
-                        if is_rate_limited_error(e):
-                            _set_hf_rate_limited()
-                            if status_cb:
-                                status_cb({
-                                    "message": "Hugging Face rate limit hit",
-                                    "source": "huggingface_priority_authors",
-                                    "filename": filename,
-                                    "detail": str(e)
-                                })
-                            return None
-                        continue
+                        return None
+                    print(f"[DEBUG] Priority author {author} list failed for {filename}: {e}")
+                    continue
+                print(f"[DEBUG] Priority author final list for {author}: {len(author_models)} repos for {filename}")
+                fallback_ids.extend(m.modelId for m in author_models if m.modelId not in scanned_ids)
+            result = scan_repos(
+                [(mid, " (priority author final)") for mid in dict.fromkeys(fallback_ids)]
+            )
+            if result is _SCAN_STOP:
+                return None
+            if result:
+                return result
                  
     except Exception as e:
+        search_failed = True
         if is_rate_limited_error(e):
-            _set_hf_rate_limited()
+            _set_hf_rate_limited(e)
             if status_cb:
                 status_cb({
                     "message": "Hugging Face rate limit hit",
@@ -1846,13 +2729,45 @@ def search_huggingface_model(
                     "detail": str(e)
                 })
 
-    if _hf_rate_limited_until and time.time() < _hf_rate_limited_until:
+    if _hf_rate_limit_active():
         return None
 
     if mode != "basic":
         _hf_search_cache[key] = None
+    if on_miss and not search_failed:
+        on_miss()
     return None
 
+def _workflow_keywords(models: List[Dict[str, Any]], limit: int = 10) -> list[str]:
+    """Most frequent filename tokens (and their digit-free forms) across a workflow."""
+    keyword_counts: Counter = Counter()
+    for model in models:
+        name = os.path.splitext(model.get("filename") or "")[0].lower()
+        if not name:
+            continue
+        tokens = []
+        for t in _NAME_TOKEN_SPLIT_RE.split(name):
+            t = t.strip()
+            if len(t) < 3:
+                continue
+            tokens.append(t)
+            alpha = _DIGITS_RE.sub("", t)
+            if len(alpha) >= 3:
+                tokens.append(alpha)
+        keyword_counts.update(tokens)
+    # most_common keeps first-seen order among equal counts.
+    return [k for k, _ in keyword_counts.most_common(limit)]
+
+_SLASH_TABLE = str.maketrans({"\\": "/"})
+
+@functools.lru_cache(maxsize=2048)
+def _normalize_dedupe_path(value: str | None) -> str:
+    if not value:
+        return ""
+    if "\\" in value:
+        value = value.translate(_SLASH_TABLE)
+    return value.strip("/")
+
 def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb=None) -> Dict[str, Any]:
     """
     Main entry point.
@@ -1861,19 +2776,24 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
     3. If missing, search HF.
     """
     
-    global _hf_api_calls, _hf_search_deadline, _hf_search_time_exhausted, _hf_rate_limited_until, _hf_repo_files_cache
-    _hf_api_calls = 0
+    global _hf_search_deadline, _hf_search_time_exhausted, _hf_rate_limited_until
+    _refill_hf_call_bucket()
     _hf_search_deadline = 0.0
     _hf_search_time_exhausted = False
-    _hf_rate_limited_until = None
-    _hf_repo_files_cache = {}
+    _hf_rate_limited_until = 0.0
+    # Keep good repo listings between runs (HF_REPO_CACHE_TTL), but retry the
+    # ones cached empty after a failed or timed-out call.
+    _hf_repo_files_cache.expire()
+    for repo_id, files in _hf_repo_files_cache.items():
+        if not files:
+            _hf_repo_files_cache.pop(repo_id)
+    _repo_basename_indexes.clear()
+    _hf_url_exists_cache.expire()
+    _hf_search_cache.expire()
+    _hf_list_models_cache.expire()
+    _restore_hf_disk_cache()
     required_models = extract_models_from_workflow(workflow_json)
 
-    def _normalize_dedupe_path(value: str | None) -> str:
-        if not value:
-            return ""
-        return value.replace("\\", "/").strip("/")
-
     def _score_entry(entry: dict) -> int:
         score = 0
         if entry.get("url"):
@@ -1912,22 +2832,33 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
     # canonical filename should be treated as one model requirement. This prevents
     # duplicate rows like `clip_vision_h.safetensors` + `clip_vision_h_fp16.safetensors`
     # and preserves widget-path auto-fix after download.
-    variant_groups: dict[tuple[Any, str, str], list[dict]] = {}
+    # Each group tracks [best_preference, best_entry, members] as it fills, so
+    # every entry is scored once and no separate max() pass is needed.
+    variant_groups: dict[tuple[Any, str, str], list] = {}
     passthrough_models: list[dict] = []
     for model in required_models:
         key = _variant_group_key(model)
         if key is None:
             passthrough_models.append(model)
             continue
-        variant_groups.setdefault(key, []).append(model)
+        current = variant_groups.get(key)
+        if current is None:
+            variant_groups[key] = [None, model, [model]]
+            continue
+        if current[0] is None:
+            current[0] = _prefer_entry_for_variant_group(current[1])
+        preference = _prefer_entry_for_variant_group(model)
+        if preference > current[0]:
+            current[0] = preference
+            current[1] = model
+        current[2].append(model)
 
     coalesced_models: list[dict] = list(passthrough_models)
-    for group in variant_groups.values():
+    for _preference, best, group in variant_groups.values():
         if len(group) == 1:
-            coalesced_models.append(group[0])
+            coalesced_models.append(best)
             continue
 
-        best = max(group, key=_prefer_entry_for_variant_group)
         merged = dict(best)
 
         if not merged.get("url"):
@@ -1973,41 +2904,39 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
 
     # Collapse duplicates within the same node+filename scope, preferring entries
     # with richer path/folder info. Do not collapse across different nodes.
-    grouped_by_name = {}
+    # Rows are keyed by first-appearance order of (node, filename) and folder so
+    # the output order matches the input; a stable sort on (-score, -path length)
+    # then leaves the preferred entry first in each group.
+    name_order: dict[tuple[Any, str], int] = {}
+    folder_order: dict[tuple[int, str], int] = {}
+    rows = []
     for model in required_models:
         filename = (model.get("filename") or "").lower()
         if not filename:
             continue
-        node_id = model.get("node_id")
-        grouped_by_name.setdefault((node_id, filename), []).append(model)
-
-    deduped = []
-    for _, models in grouped_by_name.items():
-        folder_groups = {}
-        for model in models:
-            folder_key = _normalize_dedupe_path(model.get("suggested_folder"))
-            folder_groups.setdefault(folder_key, []).append(model)
-
-        # If we have folder-specific entries, drop ambiguous ones without a folder.
-        if len(folder_groups) > 1 and "" in folder_groups:
-            del folder_groups[""]
-
-        for group in folder_groups.values():
-            best = group[0]
-            best_score = _score_entry(best)
-            for candidate in group[1:]:
-                cand_score = _score_entry(candidate)
-                if cand_score > best_score:
-                    best = candidate
-                    best_score = cand_score
-                elif cand_score == best_score:
-                    # Tie-breaker: prefer longer requested_path (keeps subfolder info).
-                    if len(_normalize_dedupe_path(candidate.get("requested_path"))) > len(_normalize_dedupe_path(best.get("requested_path"))):
-                        best = candidate
-                        best_score = cand_score
-            deduped.append(best)
-
-    required_models = deduped
+        name_idx = name_order.setdefault((model.get("node_id"), filename), len(name_order))
+        folder_key = _normalize_dedupe_path(model.get("suggested_folder"))
+        folder_idx = folder_order.setdefault((name_idx, folder_key), len(folder_order))
+        rows.append((
+            (name_idx, folder_idx),
+            -_score_entry(model),
+            -len(_normalize_dedupe_path(model.get("requested_path"))),
+            model
+        ))
+    rows.sort(key=lambda row: row[:3])
+
+    # If we have folder-specific entries, drop ambiguous ones without a folder.
+    folder_counts = Counter(name_idx for name_idx, _folder_key in folder_order)
+    ambiguous_folders = {
+        folder_idx
+        for (name_idx, folder_key), folder_idx in folder_order.items()
+        if not folder_key and folder_counts[name_idx] > 1
+    }
+    required_models = [
+        next(group)[3]
+        for (_name_idx, folder_idx), group in itertools.groupby(rows, key=lambda row: row[0])
+        if folder_idx not in ambiguous_folders
+    ]
 
     # Normalize Nunchaku SVDQ precision before local presence checks.
     # This ensures incompatible workflow variants are treated as mismatch/missing and can be corrected.
@@ -2049,20 +2978,7 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
             seen_model_node_pairs.add(key)
     
     # Collect workflow-wide keywords to bias repo ordering.
-    keyword_counts: dict[str, int] = {}
-    for model in required_models:
-        name = os.path.splitext(model.get("filename") or "")[0].lower()
-        if not name:
-            continue
-        for t in re.split(r"[-_]", name):
-            t = t.strip().lower()
-            if len(t) < 3:
-                continue
-            keyword_counts[t] = keyword_counts.get(t, 0) + 1
-            alpha = re.sub(r"\d+", "", t)
-            if len(alpha) >= 3:
-                keyword_counts[alpha] = keyword_counts.get(alpha, 0) + 1
-    workflow_keywords = [k for k, _ in sorted(keyword_counts.items(), key=lambda kv: kv[1], reverse=True)[:10]]
+    workflow_keywords = _workflow_keywords(required_models)
 
     # 1. Check local existence using ComfyUI's folder_paths
     missing_models, existing_models, path_mismatches = check_model_files(unique_required_models)
@@ -2106,6 +3022,7 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
     # 3. Check curated popular models registry
     if missing_models:
         popular_models = load_popular_models_registry()
+        popular_candidates: list[tuple[dict, dict, list[str]]] = []
         for model in missing_models:
             if model.get("url"):
                 continue
@@ -2122,12 +3039,31 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
             candidate_urls = _iter_registry_urls(entry)
             if not candidate_urls:
                 continue
+            popular_candidates.append((model, entry, candidate_urls))
+
+        # Probe curated URLs in rounds: round N checks the Nth candidate of every
+        # model still unresolved, concurrently, so liveness checks overlap and
+        # fallback URLs are only probed when the preferred one is dead.
+        live_urls: dict[int, str] = {}
+        unresolved = list(range(len(popular_candidates)))
+        round_index = 0
+        while unresolved:
+            round_urls = {
+                idx: popular_candidates[idx][2][round_index]
+                for idx in unresolved
+                if round_index < len(popular_candidates[idx][2])
+            }
+            if not round_urls:
+                break
+            url_liveness = _hf_urls_exist(list(round_urls.values()))
+            for idx, url in round_urls.items():
+                if url_liveness.get(url):
+                    live_urls[idx] = url
+            unresolved = [idx for idx in round_urls if idx not in live_urls]
+            round_index += 1
 
-            live_url = None
-            for candidate_url in candidate_urls:
-                if _hf_url_exists(candidate_url):
-                    live_url = candidate_url
-                    break
+        for idx, (model, entry, candidate_urls) in enumerate(popular_candidates):
+            live_url = live_urls.get(idx)
 
             if not live_url:
                 print(f"[DEBUG] Skipping stale curated URLs for {model.get('filename')}; falling back to other sources")
@@ -2159,7 +3095,9 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
         name = (model.get("filename") or "").lower()
         return name in skip_filenames
 
-    if missing_models and skip_hf_search_all:
+    # Reuse earlier search results (this process or the disk cache) before any
+    # HF stage runs, so cached files skip the priority repo scan as well.
+    if missing_models:
         reused_cache_hits = 0
         for model in missing_models:
             if model.get("url"):
@@ -2176,7 +3114,7 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
             model["hf_path"] = cached.get("hf_path")
             model["source"] = "huggingface_cache"
             reused_cache_hits += 1
-        if status_cb:
+        if skip_hf_search_all and status_cb:
             status_cb({
                 "message": "Skipping unresolved Hugging Face lookups",
                 "source": "huggingface_skip",
@@ -2186,13 +3124,30 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
     # 5. Search HF for remaining missing models (that didn't have URL from registry/manager)
     priority_author_repos: dict[str, list[str]] | None = None
     api = None
-    if missing_models and not skip_hf_search_all:
+    # Models the HF stages below may search for, filtered once; each stage only
+    # re-checks whether an earlier one filled in a URL.
+    hf_candidates: list[dict] = []
+    if not skip_hf_search_all:
+        for model in missing_models:
+            if model.get("url"):
+                continue
+            if _skip_hf_search(model):
+                print(f"[DEBUG] Skipping HF search for {model.get('filename')} (user skipped)")
+                continue
+            # A cached None is a recent full search that found nothing (or a
+            # generic filename); don't repeat the repo scan and searches for it.
+            key = _normalize_hf_search_key(model.get("filename") or "")
+            if _hf_search_cache.get(key, _CACHE_MISS) is None:
+                print(f"[DEBUG] Skipping HF search for {model.get('filename')} (recent miss cached)")
+                continue
+            hf_candidates.append(model)
+    if hf_candidates:
         priority_author_repos = {}
         try:
-            api = HfApi(token=token)
+            api = _get_hf_api(token)
             for author in PRIORITY_AUTHORS:
                 try:
-                    repos = list(call_with_timeout(api.list_models, author=author, limit=100, sort="downloads", direction=-1))
+                    repos = _list_author_models(api, author)
                     priority_author_repos[author] = [m.modelId for m in repos if getattr(m, "modelId", None)]
                 except Exception as e:
                     print(f"[DEBUG] Priority author {author} list fetch failed: {e}")
@@ -2201,60 +3156,54 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
             print(f"[DEBUG] Priority author repo cache init failed: {e}")
             priority_author_repos = None
 
-    priority_tokens: list[str] = []
-    if missing_models and not skip_hf_search_all:
-        for model in missing_models:
-            if model.get("url"):
-                continue
-            filename = model.get("filename")
-            if not filename:
-                continue
-            stem = os.path.splitext(filename)[0].lower()
-            for part in re.split(r"[-_]", stem):
-                part = part.strip().lower()
-                if len(part) >= 3:
-                    priority_tokens.append(part)
-                alpha = re.sub(r"\d+", "", part)
-                if len(alpha) >= 3:
-                    priority_tokens.append(alpha)
-    priority_tokens = list(dict.fromkeys(priority_tokens))
-
-    def _workflow_match_repo(repo_id: str) -> bool:
-        if not workflow_keywords:
-            return False
-        repo_lower = repo_id.lower()
-        return any(k in repo_lower for k in workflow_keywords)
-
-    def _workflow_repo_score(repo_id: str) -> int:
+    # Filename tokens of the files still unresolved, deduped in first-seen order.
+    priority_token_set: dict[str, None] = {}
+    for model in hf_candidates:
+        filename = model.get("filename")
+        if not filename:
+            continue
+        stem = os.path.splitext(filename)[0].lower()
+        for part in _NAME_TOKEN_SPLIT_RE.split(stem):
+            part = part.strip()
+            if len(part) >= 3:
+                priority_token_set[part] = None
+            alpha = _DIGITS_RE.sub("", part) if not part.isalpha() else part
+            if len(alpha) >= 3:
+                priority_token_set[alpha] = None
+    priority_tokens = list(priority_token_set)
+
+    def _workflow_repo_rank(repo_id: str) -> tuple[int, int]:
+        """
+        (0 if a workflow keyword is in the repo id else 1, -score), from a single
+        pass over the lowered id; ascending sort puts the best repos first.
+        """
+        if not workflow_keywords and not priority_tokens:
+            return (1, 0)
         repo_lower = repo_id.lower()
-        score = 0
-        for k in workflow_keywords or []:
-            if k and k in repo_lower:
-                score += 5
-        for t in priority_tokens:
-            if t and t in repo_lower:
-                score += 4
-        if _workflow_match_repo(repo_id):
+        keyword_hits = sum(1 for k in workflow_keywords if k in repo_lower)
+        token_hits = sum(1 for t in priority_tokens if t in repo_lower)
+        score = keyword_hits * 5 + token_hits * 4
+        if keyword_hits:
             score += 50
-        return score
-
-    def _scan_priority_repos_for_missing():
+        return (0 if keyword_hits else 1, -score)
+
+    def _scan_priority_repos_for_missing() -> bool:
+        """
+        Match unresolved files against priority repo listings. True when every
+        listing was checked; False after a budget/rate-limit stop or a listing
+        that failed, so misses aren't trusted.
+        """
         if not priority_author_repos or not api:
-            return
+            return False
         priority_repo_ids = []
         for author in PRIORITY_AUTHORS:
             priority_repo_ids.extend(priority_author_repos.get(author, []))
         priority_repo_ids = list(dict.fromkeys(priority_repo_ids))
         if not priority_repo_ids:
-            return
-        repo_order = {rid: idx for idx, rid in enumerate(priority_repo_ids)}
-        priority_repo_ids.sort(
-            key=lambda rid: (
-                0 if _workflow_match_repo(rid) else 1,
-                -_workflow_repo_score(rid),
-                repo_order.get(rid, 0)
-            )
-        )
+            return True
+        # sort() computes each key once and is stable, so repos with equal rank
+        # keep the author listing order without an explicit index tiebreaker.
+        priority_repo_ids.sort(key=_workflow_repo_rank)
         if PRIORITY_REPO_SCAN_LIMIT > 0:
             priority_repo_ids[:] = priority_repo_ids[:PRIORITY_REPO_SCAN_LIMIT]
 
@@ -2265,9 +3214,8 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
             })
 
         remaining: dict[str, dict] = {}
-        for model in [m for m in missing_models if not m.get("url")]:
-            if _skip_hf_search(model):
-                print(f"[DEBUG] Skipping HF search for {model.get('filename')} (user skipped)")
+        for model in hf_candidates:
+            if model.get("url"):
                 continue
             filename = model.get("filename")
             if not filename:
@@ -2275,132 +3223,220 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
             remaining[filename.lower()] = model
 
         if not remaining:
-            return
+            return True
 
-        for repo_id in priority_repo_ids:
+        if len(remaining) <= PRIORITY_PROBE_THRESHOLD:
+            # Few files left: root HEADs can be cheaper than listing whole repos.
+            # Listings already cached (author sibling priming) are matched by the
+            # scan below for free, so only files none of them holds are probed,
+            # and only in repos without a listing; anything still missing is listed.
+            cached_bases: set[str] = set()
+            unlisted_repo_ids: list[str] = []
+            for repo_id in priority_repo_ids:
+                files = _hf_repo_files_cache.get(repo_id)
+                if files:
+                    index = _repo_basename_index(repo_id, files)
+                    cached_bases.update(base for base in remaining if base in index)
+                else:
+                    unlisted_repo_ids.append(repo_id)
+            probe_models = {
+                model["filename"]: base
+                for base, model in remaining.items()
+                if base not in cached_bases
+            }
+            root_hits = (
+                _find_at_repo_roots(unlisted_repo_ids, list(probe_models))
+                if unlisted_repo_ids and probe_models
+                else {}
+            )
+            for name, repo_id in root_hits.items():
+                base = probe_models[name]
+                model = remaining.pop(base)
+                match_path = model["filename"]
+                url = f"https://huggingface.co/{repo_id}/resolve/main/{match_path}"
+                model["url"] = url
+                model["hf_repo"] = repo_id
+                model["hf_path"] = match_path
+                model["source"] = "priority_repo_scan"
+                _hf_search_cache[base] = {
+                    "url": url,
+                    "hf_repo": repo_id,
+                    "hf_path": match_path
+                }
+                print(f"[DEBUG] Found {match_path} at root of repo {repo_id} (priority repo probe)")
             if not remaining:
-                break
-            current_model = next(iter(remaining.values()))
-            current_filename = current_model.get("filename") or ""
-            author = repo_id.split("/")[0] if "/" in repo_id else repo_id
-            if status_cb:
-                status_cb({
-                    "message": f"Searching {author}",
-                    "source": "huggingface_priority_repos",
-                    "filename": current_filename,
-                    "detail": author
-                })
-            try:
-                files = _get_repo_files(api, repo_id, token)
-            except HFSearchBudgetError:
-                print(f"[DEBUG] HF search budget/rate limit hit before priority repo scan for {current_filename}")
-                if status_cb:
-                    status_cb({
-                        "message": "Hugging Face search budget exhausted",
-                        "source": "huggingface_priority_repos",
-                        "filename": current_filename
-                    })
-                return
-            except concurrent.futures.TimeoutError:
-                print(f"[DEBUG] list_repo_files timeout for {repo_id} while searching {current_filename} (priority repo scan)")
+                return True
+
+        # Listings stream in priority order with a sliding window of requests in
+        # flight; closing the generator on exit cancels whatever hasn't started.
+        listings = _iter_repo_files(api, priority_repo_ids, token)
+        complete = True
+        try:
+            for repo_id, files, error in listings:
+                current_model = next(iter(remaining.values()))
+                current_filename = current_model.get("filename") or ""
+                author = repo_id.split("/")[0] if "/" in repo_id else repo_id
                 if status_cb:
                     status_cb({
-                        "message": "Hugging Face search timeout",
+                        "message": f"Searching {author}",
                         "source": "huggingface_priority_repos",
                         "filename": current_filename,
-                        "detail": f"list_repo_files({repo_id})"
+                        "detail": author
                     })
-                continue
-            except Exception as e:
-                if is_timeout_error(e):
-                    print(f"[DEBUG] list_repo_files timeout for {repo_id} while searching {current_filename} (priority repo scan)")
+                if isinstance(error, HFSearchBudgetError):
+                    print(f"[DEBUG] HF search budget/rate limit hit before priority repo scan for {current_filename}")
                     if status_cb:
                         status_cb({
-                            "message": "Hugging Face search timeout",
+                            "message": "Hugging Face search budget exhausted",
                             "source": "huggingface_priority_repos",
-                            "filename": current_filename,
-                            "detail": f"list_repo_files({repo_id})"
+                            "filename": current_filename
                         })
+                    return False
+                if error is not None:
+                    complete = False
+                    if isinstance(error, concurrent.futures.TimeoutError) or is_timeout_error(error):
+                        print(f"[DEBUG] list_repo_files timeout for {repo_id} while searching {current_filename} (priority repo scan)")
+                        if status_cb:
+                            status_cb({
+                                "message": "Hugging Face search timeout",
+                                "source": "huggingface_priority_repos",
+                                "filename": current_filename,
+                                "detail": f"list_repo_files({repo_id})"
+                            })
+                        continue
+                    if is_rate_limited_error(error):
+                        _set_hf_rate_limited(error)
+                        if status_cb:
+                            status_cb({
+                                "message": "Hugging Face rate limit hit",
+                                "source": "huggingface_priority_repos",
+                                "filename": current_filename,
+                                "detail": str(error)
+                            })
+                        return False
                     continue
-                if is_rate_limited_error(e):
-                    _set_hf_rate_limited()
-                    if status_cb:
-                        status_cb({
-                            "message": "Hugging Face rate limit hit",
-                            "source": "huggingface_priority_repos",
-                            "filename": current_filename,
-                            "detail": str(e)
-                        })
-                    return
-                continue
 
-            found_paths: dict[str, str] = {}
-            for f in files:
-                base = os.path.basename(f).lower()
-                if base not in remaining:
-                    continue
-                prev = found_paths.get(base)
-                if prev is None or len(f) < len(prev):
-                    found_paths[base] = f
+                # Repo paths always use "/", so rpartition is enough for the basename
+                # and avoids a posixpath call per file in large listings.
+                found_paths: dict[str, str] = {}
+                for f in files:
+                    base = f.rpartition("/")[2].lower()
+                    if base not in remaining:
+                        continue
+                    prev = found_paths.get(base)
+                    if prev is None or len(f) < len(prev):
+                        found_paths[base] = f
 
-            for base, match_path in found_paths.items():
-                model = remaining.pop(base, None)
-                if not model:
-                    continue
-                model["url"] = f"https://huggingface.co/{repo_id}/resolve/main/{match_path}"
-                model["hf_repo"] = repo_id
-                model["hf_path"] = match_path
-                model["source"] = "priority_repo_scan"
-                _hf_search_cache[base] = {
-                    "url": model["url"],
-                    "hf_repo": repo_id,
-                    "hf_path": match_path
-                }
-                print(f"[DEBUG] Found {model.get('filename')} in repo {repo_id} (priority repo scan)")
+                for base, match_path in found_paths.items():
+                    model = remaining.pop(base, None)
+                    if not model:
+                        continue
+                    model["url"] = f"https://huggingface.co/{repo_id}/resolve/main/{match_path}"
+                    model["hf_repo"] = repo_id
+                    model["hf_path"] = match_path
+                    model["source"] = "priority_repo_scan"
+                    _hf_search_cache[base] = {
+                        "url": model["url"],
+                        "hf_repo": repo_id,
+                        "hf_path": match_path
+                    }
+                    print(f"[DEBUG] Found {model.get('filename')} in repo {repo_id} (priority repo scan)")
+                if not remaining:
+                    break
+        finally:
+            listings.close()
+        return complete
 
-    if missing_models and priority_author_repos and not skip_hf_search_all:
+    priority_scan_complete = False
+    if hf_candidates and priority_author_repos:
         _reset_hf_search_budget()
-        _scan_priority_repos_for_missing()
+        priority_scan_complete = _scan_priority_repos_for_missing()
+
+    # Candidates whose HF search ran to the end without a match, by id().
+    searched_misses: set[int] = set()
+
+    # Repos (and folders within them) that served files of this workflow;
+    # later searches probe them first since models tend to come in sets.
+    resolved_repos: dict[str, dict[str, None]] = {}
+    resolved_repos_lock = threading.Lock()
+
+    def _note_resolved_repo(repo_id: str | None, path: str | None) -> None:
+        if not repo_id or not path:
+            return
+        folder = path.rpartition("/")[0]
+        with resolved_repos_lock:
+            folders = resolved_repos.setdefault(repo_id, {"": None})
+            folders.setdefault(folder, None)
+
+    def _resolved_repos_snapshot() -> list[tuple[str, list[str]]]:
+        with resolved_repos_lock:
+            return [(repo_id, list(folders)) for repo_id, folders in resolved_repos.items()]
+
+    def _search_missing_model(m: dict, label: str, mode: str) -> bool:
+        """Search HF for one missing model; False when the search budget is spent."""
+        if _hf_search_budget_exhausted():
+            return False
+        if status_cb:
+            status_cb({
+                "message": f"Searching Hugging Face ({label})",
+                "source": "huggingface_search",
+                "filename": m.get("filename")
+            })
+        result = search_huggingface_model(
+            m["filename"],
+            token,
+            status_cb=status_cb,
+            mode=mode,
+            workflow_keywords=workflow_keywords,
+            priority_author_repos=priority_author_repos,
+            skip_priority_repo_scan=True,
+            resolved_repos=_resolved_repos_snapshot(),
+            on_miss=lambda: searched_misses.add(id(m))
+        )
+        if result:
+            m["url"] = result.get("url")
+            m["hf_repo"] = result.get("hf_repo")
+            m["hf_path"] = result.get("hf_path")
+            m["source"] = "huggingface_search"
+            _note_resolved_repo(m["hf_repo"], m["hf_path"])
+        return True
 
     def _run_hf_stage(label: str, mode: str):
         _reset_hf_search_budget()
-        for m in [m for m in missing_models if not m.get("url")]:
-            if _skip_hf_search(m):
-                print(f"[DEBUG] Skipping HF search for {m.get('filename')} (user skipped)")
-                continue
-            if _hf_search_budget_exhausted():
-                if status_cb:
-                    status_cb({
-                        "message": "Hugging Face search budget exhausted",
-                        "source": "huggingface_search",
-                        "filename": m.get("filename")
-                    })
-                break
-            if status_cb:
-                status_cb({
-                    "message": f"Searching Hugging Face ({label})",
-                    "source": "huggingface_search",
-                    "filename": m.get("filename")
-                })
-            result = search_huggingface_model(
-                m["filename"],
-                token,
-                status_cb=status_cb,
-                mode=mode,
-                workflow_keywords=workflow_keywords,
-                priority_author_repos=priority_author_repos,
-                skip_priority_repo_scan=True
-            )
-            if result:
-                m["url"] = result.get("url")
-                m["hf_repo"] = result.get("hf_repo")
-                m["hf_path"] = result.get("hf_path")
-                m["source"] = "huggingface_search"
+        for m in missing_models:
+            if m.get("url"):
+                _note_resolved_repo(m.get("hf_repo"), m.get("hf_path"))
+        pending = [m for m in hf_candidates if not m.get("url")]
+        if not pending:
+            return
+        # Searches for different files are network-bound; run a few at once. The
+        # shared token bucket still caps the overall HF call rate.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(HF_SEARCH_FILE_WORKERS, len(pending)),
+            thread_name_prefix="hf-file-search"
+        ) as pool:
+            outcomes = pool.map(lambda m: _search_missing_model(m, label, mode), pending)
+            for m, searched in zip(pending, outcomes):
+                if not searched:
+                    if status_cb:
+                        status_cb({
+                            "message": "Hugging Face search budget exhausted",
+                            "source": "huggingface_search",
+                            "filename": m.get("filename")
+                        })
+                    break
 
-    if missing_models and not skip_hf_search_all:
+    if hf_candidates:
         _run_hf_stage("basic", "basic")
         if priority_author_repos is None:
             _run_hf_stage("priority", "priority")
+        elif priority_scan_complete and not _hf_rate_limit_active():
+            # The basic search only caches hits, so with the priority repo scan
+            # standing in for the priority stage, record files both searched
+            # fully without a match; _save_hf_disk_cache persists the misses.
+            for m in hf_candidates:
+                if not m.get("url") and id(m) in searched_misses:
+                    _hf_search_cache[_normalize_hf_search_key(m["filename"])] = None
 
     final_missing = missing_models
 
@@ -2421,6 +3457,8 @@ def process_workflow_for_missing_models(workflow_json: Dict[str, Any], status_cb
             if alternatives:
                 model["alternatives"] = alternatives
 
+    _save_hf_disk_cache()
+
     return {
         "missing": final_missing,
         "found": existing_models,
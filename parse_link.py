@@ -1,8 +1,14 @@
+import functools
 from urllib.parse import urlparse, parse_qs
 
+# Path keywords in order of precedence when a link contains more than one.
+_PATH_KEYWORDS = ("resolve", "blob", "tree")
+
 def parse_link(link: str) -> dict:
     """
     Parse a Hugging Face URL or shorthand string.
+    Results are memoized per link (LRU, 4096 entries); callers get a fresh copy
+    they may modify.
     Supports URLs with keywords "resolve", "blob", or "tree".
     Returns a dictionary with keys:
       - repo: e.g., "username/repo"
@@ -10,11 +16,13 @@ def parse_link(link: str) -> dict:
       - subfolder: if present (the path inside the repo)
       - file: if present (the file name for file downloads)
     """
+    return dict(_parse_link_cached(link))
+
+@functools.lru_cache(maxsize=4096)
+def _parse_link_cached(link: str) -> dict:
     parsed_url = urlparse(link)
-    if parsed_url.scheme:
-        path_parts = parsed_url.path.strip("/").split("/")
-    else:
-        path_parts = link.strip("/").split("/")
+    path = parsed_url.path.strip("/") if parsed_url.scheme else link.strip("/")
+    path_parts = path.split("/")
 
     result = {}
     if len(path_parts) >= 2:
@@ -22,37 +30,41 @@ def parse_link(link: str) -> dict:
     else:
         raise ValueError("Link does not contain repository information.")
 
-    if "resolve" in path_parts:
-        idx = path_parts.index("resolve")
-        if len(path_parts) > idx + 1:
-            result["revision"] = path_parts[idx+1]
-        if len(path_parts) > idx + 2:
-            remaining = path_parts[idx+2:]
-            if remaining:
-                if len(remaining) > 1:
-                    result["subfolder"] = "/".join(remaining[:-1])
-                result["file"] = remaining[-1]
-    elif "blob" in path_parts:
-        idx = path_parts.index("blob")
-        if len(path_parts) > idx + 1:
+    # One pass records where each keyword first appears.
+    keyword_index = {}
+    for i, part in enumerate(path_parts):
+        if part in _PATH_KEYWORDS:
+            keyword_index.setdefault(part, i)
+    kind = next((k for k in _PATH_KEYWORDS if k in keyword_index), None)
+    idx = keyword_index.get(kind, -1)
+
+    n_parts = len(path_parts)
+    if kind in ("resolve", "blob"):
+        if n_parts > idx + 1:
             result["revision"] = path_parts[idx+1]
-        if len(path_parts) > idx + 2:
-            remaining = path_parts[idx+2:]
-            if remaining:
-                if len(remaining) > 1:
-                    result["subfolder"] = "/".join(remaining[:-1])
-                result["file"] = remaining[-1]
-    elif "tree" in path_parts:
-        idx = path_parts.index("tree")
-        if len(path_parts) > idx + 1:
+        if n_parts > idx + 2:
+            subfolder, sep, filename = _path_after(path, idx + 2).rpartition("/")
+            if sep:
+                result["subfolder"] = subfolder
+            result["file"] = filename
+    elif kind == "tree":
+        if n_parts > idx + 1:
             result["revision"] = path_parts[idx+1]
-        if len(path_parts) > idx + 2:
-            result["subfolder"] = "/".join(path_parts[idx+2:])
+        if n_parts > idx + 2:
+            result["subfolder"] = _path_after(path, idx + 2)
     else:
-        if len(path_parts) > 2:
+        if n_parts > 2:
+            rest = _path_after(path, 2)
             if "." in path_parts[-1]:
-                result["subfolder"] = "/".join(path_parts[2:-1])
+                result["subfolder"] = rest.rpartition("/")[0]
                 result["file"] = path_parts[-1]
             else:
-                result["subfolder"] = "/".join(path_parts[2:])
+                result["subfolder"] = rest
     return result
+
+def _path_after(path: str, count: int) -> str:
+    """The part of a "/"-separated path after its first `count` components."""
+    start = 0
+    for _ in range(count):
+        start = path.index("/", start) + 1
+    return path[start:]
@@ -1,12 +1,15 @@
 import os
 import json
+import re
 import traceback
 import threading
 import time
 import uuid
 import asyncio
 import mimetypes
+import functools
 from datetime import datetime, timezone
+from types import MappingProxyType
 from urllib.parse import urlparse
 from aiohttp import web
 from .backup import (
@@ -26,6 +29,12 @@ try:
 except Exception:
     folder_paths = None
 
+try:
+    import orjson  # Optional: much faster parsing of the multi-MB catalog files.
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 download_queue = []
 download_queue_lock = threading.Lock()
 download_status = {}
@@ -58,7 +67,9 @@ MODEL_LIBRARY_PRIORITY_CATALOG_PATH = os.path.join(
 )
 MODEL_LIBRARY_BACKEND_SETTING = "downloader.model_library_backend_enabled"
 HUGGINGFACE_HOST = "huggingface.co"
-MODEL_LIBRARY_EXTENSIONS = {
+# Netloc of "scheme://netloc/..." or "//netloc/...", as urlparse splits it.
+_URL_NETLOC_RE = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:)?//([^/?#]*)")
+MODEL_LIBRARY_EXTENSIONS = frozenset({
     ".safetensors",
     ".ckpt",
     ".pt",
@@ -71,7 +82,8 @@ MODEL_LIBRARY_EXTENSIONS = {
     ".yml",
     ".torchscript",
     ".zip",
-}
+})
+MODEL_LIBRARY_EXTENSIONS_NOPREFIX = frozenset(ext[1:] for ext in MODEL_LIBRARY_EXTENSIONS)
 MODEL_LIBRARY_LOCAL_TYPE_MAP = {
     "checkpoints": "checkpoint",
     "diffusion_models": "diffusion_model",
@@ -263,18 +275,25 @@ def _clear_cancel_request(download_id: str):
     with cancel_requests_lock:
         cancel_requests.discard(download_id)
 
+def _url_netloc(value: str) -> str:
+    """Lowercased urlparse(value).netloc, via one regex match in the common case."""
+    if not value or value[0] <= " " or any(ch in value for ch in "\t\r\n["):
+        # urlparse strips leading whitespace/control characters and tabs/newlines,
+        # and validates IPv6 brackets; leave those rare inputs to it.
+        try:
+            return (urlparse(value).netloc or "").lower()
+        except Exception:
+            return ""
+    match = _URL_NETLOC_RE.match(value)
+    return match.group(1).lower() if match else ""
+
 def _is_huggingface_url(url: str | None) -> bool:
     if not isinstance(url, str):
         return False
     value = url.strip()
     if not value:
         return False
-    try:
-        parsed = urlparse(value)
-    except Exception:
-        return False
-    host = (parsed.netloc or "").lower()
-    return host == HUGGINGFACE_HOST
+    return _url_netloc(value) == HUGGINGFACE_HOST
 
 def _is_supported_hf_link(value: str | None) -> bool:
     if _is_huggingface_url(value):
@@ -362,10 +381,7 @@ def _extract_provider(entry: dict) -> str:
         return provider.strip().lower()
     url = entry.get("url")
     if isinstance(url, str) and url.startswith("http"):
-        try:
-            return urlparse(url).netloc.lower()
-        except Exception:
-            return ""
+        return _url_netloc(url)
     return ""
 
 def _normalize_rel_path(path: str) -> str:
@@ -389,6 +405,11 @@ def _candidate_settings_paths() -> list[str]:
         unique.append(normalized)
     return unique
 
+def _load_json_file(path: str):
+    """Read a JSON file as bytes and parse it with orjson when available."""
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
 def _read_settings_dict() -> dict:
     global settings_cache
     settings_path = None
@@ -410,8 +431,7 @@ def _read_settings_dict() -> dict:
             return data if isinstance(data, dict) else {}
 
     try:
-        with open(settings_path, "r", encoding="utf-8") as f:
-            payload = json.load(f)
+        payload = _load_json_file(settings_path)
     except Exception:
         payload = {}
 
@@ -435,11 +455,40 @@ def _get_models_root() -> str:
         base_path = os.getcwd()
     return os.path.join(base_path, "models")
 
+@functools.lru_cache(maxsize=1024)
 def _infer_local_type(directory: str) -> str:
     normalized = _normalize_rel_path(directory)
     root = normalized.split("/", 1)[0] if normalized else ""
     return MODEL_LIBRARY_LOCAL_TYPE_MAP.get(root, "checkpoint")
 
+def _iter_model_files(directory: str, rel_dir: str = ""):
+    """
+    Yield (DirEntry, rel_dir) for every non-directory under `directory`, with
+    rel_dir the "/"-joined folder path relative to the scan root. Like os.walk,
+    symlinked directories are not descended into and unreadable ones are skipped.
+    """
+    try:
+        scanner = os.scandir(directory)
+    except OSError:
+        return
+    subdirs = []
+    with scanner:
+        for entry in scanner:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                yield entry, rel_dir
+                continue
+            try:
+                if not entry.is_symlink():
+                    subdirs.append(entry)
+            except OSError:
+                pass
+    for entry in subdirs:
+        yield from _iter_model_files(entry.path, f"{rel_dir}/{entry.name}" if rel_dir else entry.name)
+
 def _scan_local_models() -> tuple[list[dict], dict[str, list[dict]]]:
     global model_library_local_cache
     now = time.time()
@@ -454,30 +503,28 @@ def _scan_local_models() -> tuple[list[dict], dict[str, list[dict]]]:
     entries: list[dict] = []
     name_map: dict[str, list[dict]] = {}
     if os.path.exists(models_root):
-        for root, _, files in os.walk(models_root):
-            for file in files:
-                ext = os.path.splitext(file)[1].lower()
-                if ext not in MODEL_LIBRARY_EXTENSIONS:
-                    continue
-                absolute_path = os.path.join(root, file)
-                rel_path = _normalize_rel_path(os.path.relpath(absolute_path, models_root))
-                directory = _normalize_rel_path(os.path.dirname(rel_path))
+        for entry, directory in _iter_model_files(models_root):
+            file = entry.name
+            stem, _, ext = file.rpartition(".")
+            # Same rule as os.path.splitext: leading dots don't start an extension.
+            if ext.lower() not in MODEL_LIBRARY_EXTENSIONS_NOPREFIX or not stem.strip("."):
+                continue
+            # DirEntry.stat() follows symlinks like os.stat and caches the result.
+            try:
+                stat = entry.stat()
+            except Exception:
                 stat = None
-                try:
-                    stat = os.stat(absolute_path)
-                except Exception:
-                    stat = None
-                record = {
-                    "filename": file,
-                    "filename_lower": file.lower(),
-                    "absolute_path": absolute_path,
-                    "rel_path": rel_path,
-                    "directory": directory,
-                    "size_bytes": int(stat.st_size) if stat else None,
-                    "modified_at": float(stat.st_mtime) if stat else None,
-                }
-                entries.append(record)
-                name_map.setdefault(record["filename_lower"], []).append(record)
+            record = {
+                "filename": file,
+                "filename_lower": file.lower(),
+                "absolute_path": entry.path,
+                "rel_path": f"{directory}/{file}" if directory else file,
+                "directory": directory,
+                "size_bytes": int(stat.st_size) if stat else None,
+                "modified_at": float(stat.st_mtime) if stat else None,
+            }
+            entries.append(record)
+            name_map.setdefault(record["filename_lower"], []).append(record)
 
     entries.sort(key=lambda item: (item.get("filename_lower", ""), item.get("rel_path", "")))
     for key in list(name_map.keys()):
@@ -513,20 +560,28 @@ def _safe_mtime(path: str | None) -> float | None:
     except Exception:
         return None
 
-def _load_models_dict_from_catalog_path(path: str | None) -> dict:
+def _load_models_dict_from_catalog_path(path: str | None) -> dict | MappingProxyType:
     if not path:
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            payload = json.load(f)
+        return _load_models_dict_cached(path, _safe_mtime(path))
     except Exception as e:
         print(f"[ERROR] Failed to load model library from {path}: {e}")
         return {}
 
+@functools.lru_cache(maxsize=4)
+def _load_models_dict_cached(path: str, mtime: float | None) -> MappingProxyType:
+    """
+    Parsed "models" mapping of a catalog file, keyed by (path, mtime) so both
+    catalog loads share one parse until the file changes. Read-only because
+    it is shared; read errors propagate and are not cached.
+    """
+    payload = _load_json_file(path)
+
     models = payload.get("models", {}) if isinstance(payload, dict) else {}
     if not isinstance(models, dict):
-        return {}
-    return models
+        models = {}
+    return MappingProxyType(models)
 
 def _build_model_library_catalog_entry(filename: str, meta: dict) -> dict | None:
     filename_clean = str(filename or "").strip()
@@ -677,6 +732,14 @@ def _load_model_library_catalog_entries() -> list[dict]:
         model_library_catalog_cache = {"signature": cache_signature, "entries": entries}
     return entries
 
+def _local_file_summary(local: dict) -> dict:
+    return {
+        "rel_path": local["rel_path"],
+        "directory": local["directory"],
+        "size_bytes": local.get("size_bytes"),
+        "modified_at": local.get("modified_at"),
+    }
+
 def _build_model_library_items(
     *,
     include_catalog: bool,
@@ -688,75 +751,60 @@ def _build_model_library_items(
     catalog_entries = _load_model_library_catalog_entries() if include_catalog else []
 
     items: list[dict] = []
-    matched_local_keys: set[tuple[str, str]] = set()
+    # Local files not claimed by a catalog entry, in scan order; matches are
+    # popped during the catalog pass so no second scan of local_entries is needed.
+    unmatched_local = (
+        {(local["filename_lower"], local["rel_path"]): local for local in local_entries}
+        if include_local_only
+        else {}
+    )
     for catalog in catalog_entries:
         if hf_only and not catalog.get("is_huggingface_url"):
             continue
         if visible_only and not catalog.get("library_visible", False):
             continue
 
-        filename = str(catalog.get("filename", "")).strip()
-        filename_lower = filename.lower()
+        filename_lower = str(catalog.get("filename", "")).strip().lower()
         local_matches = local_name_map.get(filename_lower, [])
+        installed_bytes = 0
+        has_installed_bytes = False
         for local in local_matches:
-            matched_local_keys.add((local["filename_lower"], local["rel_path"]))
-
-        installed_paths = [local["rel_path"] for local in local_matches]
-        installed_bytes = [
-            local.get("size_bytes")
-            for local in local_matches
-            if isinstance(local.get("size_bytes"), int)
-        ]
-
-        item = dict(catalog)
-        item["source_kind"] = "catalog"
-        item["installed"] = len(local_matches) > 0
-        item["installed_count"] = len(local_matches)
-        item["installed_paths"] = installed_paths
-        item["installed_bytes_total"] = sum(installed_bytes) if installed_bytes else None
-        item["local_files"] = [
-            {
-                "rel_path": local["rel_path"],
-                "directory": local["directory"],
-                "size_bytes": local.get("size_bytes"),
-                "modified_at": local.get("modified_at"),
-            }
-            for local in local_matches
-        ]
-        item["downloadable"] = bool(item.get("url")) and bool(item.get("is_huggingface_url"))
-        items.append(item)
-
-    if include_local_only:
-        for local in local_entries:
-            key = (local["filename_lower"], local["rel_path"])
-            if key in matched_local_keys:
-                continue
-            item = {
-                "filename": local["filename"],
-                "name": local["filename"],
-                "directory": local["directory"],
-                "type": _infer_local_type(local["directory"]),
-                "provider": "",
-                "url": None,
-                "source": "local_scan",
-                "source_kind": "local",
-                "library_visible": True,
-                "installed": True,
-                "installed_count": 1,
-                "installed_paths": [local["rel_path"]],
-                "installed_bytes_total": local.get("size_bytes"),
-                "local_files": [
-                    {
-                        "rel_path": local["rel_path"],
-                        "directory": local["directory"],
-                        "size_bytes": local.get("size_bytes"),
-                        "modified_at": local.get("modified_at"),
-                    }
-                ],
-                "downloadable": False,
-                "is_huggingface_url": False,
-            }
-            items.append(item)
+            unmatched_local.pop((local["filename_lower"], local["rel_path"]), None)
+            size_bytes = local.get("size_bytes")
+            if isinstance(size_bytes, int):
+                installed_bytes += size_bytes
+                has_installed_bytes = True
+
+        items.append({
+            **catalog,
+            "source_kind": "catalog",
+            "installed": bool(local_matches),
+            "installed_count": len(local_matches),
+            "installed_paths": [local["rel_path"] for local in local_matches],
+            "installed_bytes_total": installed_bytes if has_installed_bytes else None,
+            "local_files": [_local_file_summary(local) for local in local_matches],
+            "downloadable": bool(catalog.get("url")) and bool(catalog.get("is_huggingface_url")),
+        })
+
+    for local in unmatched_local.values():
+        items.append({
+            "filename": local["filename"],
+            "name": local["filename"],
+            "directory": local["directory"],
+            "type": _infer_local_type(local["directory"]),
+            "provider": "",
+            "url": None,
+            "source": "local_scan",
+            "source_kind": "local",
+            "library_visible": True,
+            "installed": True,
+            "installed_count": 1,
+            "installed_paths": [local["rel_path"]],
+            "installed_bytes_total": local.get("size_bytes"),
+            "local_files": [_local_file_summary(local)],
+            "downloadable": False,
+            "is_huggingface_url": False,
+        })
 
     items.sort(key=lambda item: str(item.get("filename", "")).lower())
     return items
@@ -781,6 +829,7 @@ def _to_iso8601(value) -> str | None:
             return None
     return None
 
+@functools.lru_cache(maxsize=2048)
 def _canonical_model_library_category(value: str | None) -> str | None:
     normalized = _normalize_rel_path(value or "").strip("/")
     if not normalized:
@@ -842,6 +891,7 @@ def _split_csv_query(value: str | None) -> list[str]:
     parts = [x.strip() for x in value.split(",")]
     return [x for x in parts if x]
 
+@functools.lru_cache(maxsize=4096)
 def _guess_mime_type(filename: str) -> str:
     guessed, _ = mimetypes.guess_type(filename or "")
     return guessed or "application/octet-stream"
@@ -1510,8 +1560,7 @@ def _read_backup_repo_name() -> str:
     if not os.path.exists(settings_path):
         return ""
     try:
-        with open(settings_path, "r", encoding="utf-8") as handle:
-            settings = json.load(handle)
+        settings = _load_json_file(settings_path)
         return settings.get("downloaderbackup.repo_name", "").strip()
     except Exception:
         return ""